@@ -0,0 +1,255 @@
+"""
+[도구] 경량 브라우저 프로필: 이미지/폰트/미디어와 수집 대상 외(제3자) 호스트를 브라우저 단계에서 차단
+  LOAD_PROFILE=light (기본) : 자원 유형 차단(CDP Network.setBlockedURLs) + 트래커 차단
+                             + 제3자 호스트 DNS 차단(--host-resolver-rules, 허용 호스트를 검토한 사이트만 도는 드라이버에 한함)
+  LOAD_PROFILE=full         : 차단 없음 (렌더링 문제 확인/비교용), 페이지별 로드 바이트 기록은 동일
+DOM 과 img src 속성만 읽으므로 이미지를 받지 않아도 썸네일 주소는 그대로 남음
+사이트별 예외: use_site(driver, {"allow_types": ["image"], "allow_hosts": ["static.example.com"]})
+ManagedDriver: 상태 확인 + 죽은 브라우저 자동 재시작 + 탐색 N회/렌더러 RSS 초과 시 교체
+"""
+
+import os
+import json
+import threading
+from urllib.parse import urlparse
+
+import replay
+
+# =========================================================
+# [설정] 환경 변수
+# =========================================================
+LOAD_PROFILE = os.environ.get("LOAD_PROFILE", "light").lower()
+BLOCK_TYPES = [t for t in os.environ.get("LOAD_BLOCK_TYPES", "image,font,media").lower().split(",") if t]
+BLOCK_THIRD_PARTY = os.environ.get("LOAD_BLOCK_THIRD_PARTY", "1") == "1"
+DRIVER_MAX_NAVIGATIONS = int(os.environ.get("DRIVER_MAX_NAVIGATIONS", "200"))   # 0 이면 탐색 수로 교체하지 않음
+DRIVER_MAX_RSS_MB = int(os.environ.get("DRIVER_MAX_RSS_MB", "1500"))            # 렌더러 RSS 합계 상한, 0 이면 확인 안 함
+DRIVER_RSS_CHECK_EVERY = 10                                                    # RSS 는 탐색 N회마다 확인 (/proc 순회 비용)
+
+TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "m3u8", "mp3", "ogg", "mov"],
+    "stylesheet": ["css"],
+}
+# 광고/분석 스크립트: 자사 도메인에서 내려와도 항상 차단
+TRACKER_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "facebook.net", "analytics.tiktok.com", "wcs.naver.net", "criteo.com", "criteo.net", "adnxs.com", "hotjar.com", "clarity.ms",
+]
+# 목록 렌더링에 쓰이는 공용 스크립트 CDN: 모든 사이트에서 허용
+SHARED_SCRIPT_HOSTS = ["cdn.jsdelivr.net", "unpkg.com", "cdnjs.cloudflare.com", "ajax.googleapis.com", "code.jquery.com"]
+# 차단된 요청은 크기를 알 수 없으므로 유형별 대표 크기로 절감량 추정 (바이트)
+TYPICAL_BYTES = {"Image": 40000, "Font": 60000, "Media": 500000, "Stylesheet": 20000, "Script": 40000}
+DEFAULT_BYTES = 10000
+SECOND_LEVEL = ("co", "or", "go", "ne", "ac", "re", "pe")
+
+_lock = threading.Lock()
+_pool_allow = set()   # 드라이버 생성 시 DNS 차단에서 제외한 사이트별 허용 호스트 (합집합)
+_dns_blocking = False # 제3자 호스트 DNS 차단을 실제로 건 드라이버가 있는지 (차단 집계용)
+_page_stats = {}
+
+# =========================================================
+# [차단 규칙] 드라이버 생성 시 (DNS) + 사이트 작업 시작 시 (URL 패턴)
+# =========================================================
+def site_domain(host):
+    # 등록 도메인 (shop.tworld.co.kr → tworld.co.kr): 같은 도메인의 하위 호스트는 자사 자원으로 간주
+    labels = host.split(":")[0].lower().split(".")
+    n = 3 if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL else 2
+    return ".".join(labels[-n:])
+
+def host_rules(hosts, allow_hosts=()):
+    excludes = ["localhost"]
+    for domain in sorted({site_domain(h) for h in hosts if h}): excludes += [domain, f"*.{domain}"]
+    excludes += sorted(set(allow_hosts))
+    if replay.REPLAY_MODE == "replay": excludes.append(urlparse(replay.server_url()).hostname)
+    return "MAP * ~NOTFOUND, " + ", ".join(f"EXCLUDE {h}" for h in excludes)
+
+def chrome_options(options, hosts, allow_hosts=(), block_dns=False):
+    # 드라이버 생성 전에 호출: hosts = 이 드라이버로 방문할 사이트 호스트, allow_hosts = 사이트별 허용 호스트 합집합
+    # block_dns: 방문할 모든 사이트의 허용 호스트를 검토했을 때만 True (외부 스크립트로 그리는 SPA 가 빈 화면이 되지 않도록)
+    global _dns_blocking
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if LOAD_PROFILE == "light" and BLOCK_THIRD_PARTY and block_dns:
+        with _lock: _pool_allow.update(allow_hosts)
+        _dns_blocking = True
+        options.add_argument(f"--host-resolver-rules={host_rules(hosts, [*SHARED_SCRIPT_HOSTS, *allow_hosts])}")
+    return options
+
+def blocked_patterns(profile=None):
+    if LOAD_PROFILE != "light": return []
+    profile = profile or {}
+    patterns = []
+    for kind in BLOCK_TYPES:
+        if kind in profile.get("allow_types", []): continue
+        for ext in TYPE_EXTENSIONS.get(kind, []): patterns += [f"*.{ext}", f"*.{ext}?*"]
+    patterns += [f"*{h}/*" for h in TRACKER_HOSTS]
+    # DNS 규칙은 드라이버 단위이므로, 다른 사이트용으로 열어 둔 호스트는 URL 패턴으로 다시 막음
+    with _lock: others = _pool_allow - set(profile.get("allow_hosts", []))
+    patterns += [f"*://{h}/*" for h in sorted(others)]
+    return patterns
+
+def drain_log(driver):
+    try: return driver.get_log("performance")
+    except: return []
+
+def use_site(driver, profile=None):
+    # 사이트 작업 시작 시 호출 (풀의 드라이버가 다른 사이트를 돌다 왔으면 차단 목록 교체)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns(profile)})
+    except Exception as e: print(f"⚠️ 차단 규칙 적용 실패: {e.__class__.__name__}")
+    drain_log(driver)
+
+# =========================================================
+# [기록] 성능 로그(Network.*)에서 페이지별 로드/차단 집계
+# =========================================================
+def page_traffic(entries):
+    reqs = {}
+    for entry in entries:
+        try: msg = json.loads(entry["message"])["message"]
+        except: continue
+        method, params = msg.get("method", ""), msg.get("params", {})
+        if not method.startswith("Network.") or "requestId" not in params: continue
+        req = reqs.setdefault(params["requestId"], {"type": "Other", "bytes": 0, "blocked": False})
+        if params.get("type"): req["type"] = params["type"]
+        if method == "Network.loadingFinished": req["bytes"] = params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed":
+            dns_blocked = _dns_blocking and "ERR_NAME_NOT_RESOLVED" in params.get("errorText", "")
+            req["blocked"] = bool(params.get("blockedReason")) or dns_blocked
+
+    blocked = {}
+    for req in reqs.values():
+        if req["blocked"]: blocked[req["type"]] = blocked.get(req["type"], 0) + 1
+    return {
+        "loaded_kb": sum(r["bytes"] for r in reqs.values()) // 1024,
+        "blocked": blocked,
+        "saved_kb": sum(TYPICAL_BYTES.get(t, DEFAULT_BYTES) * n for t, n in blocked.items()) // 1024,
+    }
+
+def log_page(driver, site, url):
+    # 페이지 로드 직후 호출: 마지막 호출 이후 쌓인 요청을 이 페이지 몫으로 집계
+    stats = {"site": site, **page_traffic(drain_log(driver))}
+    with _lock: _page_stats[url] = stats
+    return stats
+
+def save_stats(path):
+    with _lock: pages = dict(_page_stats)
+    if not pages: return {}
+    summary = {}
+    for st in pages.values():
+        s = summary.setdefault(st["site"], {"pages": 0, "loaded_kb": 0, "saved_kb": 0, "blocked": 0})
+        s["pages"] += 1
+        s["loaded_kb"] += st["loaded_kb"]
+        s["saved_kb"] += st["saved_kb"]
+        s["blocked"] += sum(st["blocked"].values())
+    for site, s in summary.items():
+        print(f"🪶 [{site}] 페이지 {s['pages']}개: 로드 {s['loaded_kb']:,}KB, 차단 {s['blocked']}건 (~{s['saved_kb']:,}KB 절감 추정)")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f: json.dump({"profile": LOAD_PROFILE, "summary": summary, "pages": pages}, f, ensure_ascii=False)
+    return summary
+
+# =========================================================
+# [수명 관리] 상태 확인 / 재시작 / 교체 (나머지 속성은 실제 드라이버로 위임)
+# =========================================================
+def process_tree(root_pids):
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit(): continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f: ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except: continue
+        children.setdefault(ppid, []).append(int(entry))
+    pids, stack = [], list(root_pids)
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+def renderer_rss_mb(driver):
+    # Linux 전용: 브라우저/chromedriver 하위 렌더러(--type=renderer) 프로세스 RSS 합계, 측정 불가면 None
+    if not os.path.isdir("/proc"): return None
+    service = getattr(driver, "service", None)
+    roots = [pid for pid in (getattr(driver, "browser_pid", None), getattr(getattr(service, "process", None), "pid", None)) if pid]
+    if not roots: return None
+    total = 0
+    for pid in process_tree(roots):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if b"--type=renderer" not in f.read(): continue
+            with open(f"/proc/{pid}/status", "r") as f: total += next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        except: continue
+    return total // 1024
+
+class ManagedDriver:
+    # factory: 새 드라이버를 만드는 함수 / on_restart(reason): 재시작 시 호출 (메트릭 집계용)
+    def __init__(self, factory, label="driver", on_restart=None):
+        self._driver, self._profile, self._page_timeout = None, None, None
+        self._factory, self._label, self._on_restart = factory, label, on_restart
+        self.navigations, self.restarts = 0, 0
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    @property
+    def raw(self):
+        if self._driver is None: self._start()
+        return self._driver
+
+    def _start(self):
+        self._driver, self.navigations = self._factory(), 0
+        # 교체/재시작으로 새로 만든 브라우저에도 직전 페이지 로드 상한 유지 (없으면 Selenium 기본 300초)
+        if self._page_timeout is not None: self._driver.set_page_load_timeout(self._page_timeout)
+        use_site(self._driver, self._profile)
+
+    def quit(self):
+        if self._driver is not None:
+            try: self._driver.quit()
+            except: pass
+            self._driver = None
+
+    def restart(self, reason):
+        print(f"♻️ [{self._label}] 브라우저 재시작: {reason}")
+        self.quit()
+        self.restarts += 1
+        if self._on_restart: self._on_restart(reason)
+        self._start()
+
+    def healthy(self):
+        if self._driver is None: return False
+        try: return self._driver.execute_script("return 1") == 1
+        except: return False
+
+    def ensure(self):
+        # 사이트 작업 전 호출: 죽었으면 재시작, 살아 있으면 교체 조건 확인
+        if self._driver is None: self._start()
+        elif not self.healthy(): self.restart("상태 확인 실패")
+        else: self.check_recycle()
+        return self
+
+    def check_recycle(self):
+        if self._driver is None: return
+        if DRIVER_MAX_NAVIGATIONS and self.navigations >= DRIVER_MAX_NAVIGATIONS:
+            return self.restart(f"탐색 {self.navigations}회")
+        if DRIVER_MAX_RSS_MB and self.navigations and self.navigations % DRIVER_RSS_CHECK_EVERY == 0:
+            rss = renderer_rss_mb(self._driver)
+            if rss and rss > DRIVER_MAX_RSS_MB: self.restart(f"렌더러 RSS {rss:,}MB")
+
+    def set_page_load_timeout(self, seconds):
+        self._page_timeout = seconds
+        self.raw.set_page_load_timeout(seconds)
+
+    def use_site(self, profile=None):
+        # 재시작 후에도 같은 사이트 규칙을 다시 적용하도록 보관
+        self._profile = profile
+        use_site(self.raw, profile)
+
+    def get(self, url):
+        self.check_recycle()
+        self.navigations += 1
+        try: return self.raw.get(url)
+        except Exception:
+            if self.healthy(): raise   # 페이지 오류(타임아웃 등)는 호출부에서 처리
+            self.restart("탐색 중 브라우저 중단")
+            self.navigations += 1
+            return self._driver.get(url)
@@ -1,26 +1,60 @@
 """
 [프로젝트] 경쟁사 프로모션 모니터링 자동화 시스템 (V68)
 [작성자] 최지원 (GTM Strategy)
-[업데이트] 2026-02-06 (V68: 변경 리포트 내 '변경 사유' 텍스트 표시 누락 수정)
+[업데이트] 2026-10-18 (V87: 썸네일 변경을 이미지 지각 해시(dHash) 거리로 판정, ETag 조건부 요청 + LRU 디스크 캐시)
 """
 
 import os
+import io
 import json
+import gzip
 import time
 import glob
+import bisect
 import random
 import re
+import sys
+import argparse
 import traceback
 import html
+import hashlib
 import difflib
+import zlib
+import shutil
+import queue
+import threading
 import requests
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
 from datetime import datetime, timedelta, timezone
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+try:
+    import re._parser as sre_parse, re._constants as sre_constants  # Python 3.11+
+except ImportError:
+    try: import sre_parse, sre_constants
+    except ImportError: sre_parse = sre_constants = None   # 내부 모듈이 없으면 노이즈 규칙 선행 lookahead 생략
+try:
+    import resource  # 최대 RSS 측정 (Unix 전용)
+except ImportError:
+    resource = None
+try:
+    from PIL import Image  # [V87] 썸네일 지각 해시 (없으면 URL 비교)
+except ImportError:
+    Image = None
 from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import replay  # [V81] 응답 녹화/재생 (REPLAY_MODE)
+import browser  # [V83] 경량 브라우저 프로필 (LOAD_PROFILE)
+try:
+    import lxml  # noqa: F401  (BeautifulSoup 파서 백엔드로만 사용)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# [V78] 브라우저 의존성(uc/selenium)은 실제 크롤링 시점에 load_browser_modules() 로 로드
+uc = By = WebDriverWait = EC = TimeoutException = None
 
 # =========================================================
 # [설정] 환경 변수
@@ -30,9 +64,119 @@ REPO_NAME = "competitor-monitor"
 SLACK_WEBHOOK_URL = os.environ.get("SLACK_WEBHOOK_URL")
 
 DATA_DIR = "data"
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshots")   # [V76] 실행별 manifest
+BLOB_DIR = os.path.join(DATA_DIR, "blobs")           # [V76] 본문 blob (해시 주소, gzip)
+SNAPSHOT_INDEX = os.path.join(DATA_DIR, "snapshot_index.json")  # [V77] 실행 목록 + 경쟁사별 바이트 위치
+BASELINE_AT = os.environ.get("BASELINE_AT", "")      # 예: "2026-02-07 08:00" → 해당 시각 이전 실행과 비교
 DOCS_DIR = "docs"
 REPORT_DIR = "docs/reports"
-SIMILARITY_THRESHOLD = 0.8
+SIMILARITY_THRESHOLD = 0.8   # [V79] 신규-종료 쌍을 같은 이벤트(URL 이동)로 볼 추정 Jaccard 하한
+SHINGLE_SIZE = 5
+MINHASH_BINS = 64            # one-permutation MinHash 서명 길이
+LSH_BANDS = 16               # 밴드당 MINHASH_BINS / LSH_BANDS 행
+TITLE_SIMILARITY = 0.5       # 제목 2-gram Jaccard 하한 (본문은 같아도 제목이 다른 이벤트 오매칭 방지)
+BOILERPLATE_DF = 0.5         # 같은 경쟁사 페이지 절반 이상에 나오는 shingle 은 공통 레이아웃으로 보고 제외
+SHARED_BODY_PAGES = 3        # 본문이 같은 페이지가 이보다 많으면 공통 오류/안내 페이지로 보고 이동 후보에서 제외
+
+# [V69] 병렬 크롤링: 드라이버 풀 크기 (경쟁사마다 도메인이 달라 사이트당 작업 1개 = 호스트당 동시 접속 1개)
+CRAWL_WORKERS = int(os.environ.get("CRAWL_WORKERS", "3"))
+
+# [V80] 비교 단계 병렬화: URL 배치/이동 매칭 단위로 프로세스 풀 분배 (COMPARE_PARALLEL=0 또는 --serial 로 직렬)
+COMPARE_PARALLEL = os.environ.get("COMPARE_PARALLEL", "1") == "1"
+COMPARE_WORKERS = int(os.environ.get("COMPARE_WORKERS", "0")) or (os.cpu_count() or 1)
+COMPARE_BATCH = 16           # 작업 1건당 비교할 URL 수 (대형 경쟁사 하나가 워커 하나를 독점하지 않도록)
+
+# [V70] 페이지 준비 대기: 관측된 로드 지연으로 타임아웃 자동 조정 (초)
+LATENCY_FILE = os.path.join(DATA_DIR, "load_latency.json")
+READY_DEFAULT_TIMEOUT = 15
+READY_MIN_TIMEOUT, READY_MAX_TIMEOUT = 4, 30
+READY_QUIET = 0.5
+READY_POLL = 0.25
+LATENCY_SAMPLES = 20
+
+# [V71] 상세 페이지 수집 방식: auto(HTTP 우선, 검증 실패 시 브라우저) / http / browser
+FETCH_MODE = os.environ.get("FETCH_MODE", "auto")
+SITE_FETCH_MODE = {
+    "U+ 유모바일": "browser",   # SPA (본문이 스크립트로 렌더링)
+    "스카이라이프": "browser",   # 봇 차단 이력
+    # 정적 HTML 의 제목 후보가 CSS 로 숨긴 검색창/모달 제목이라 브라우저 제목과 다름 (HTTP 제목 검증 전까지 브라우저)
+    "SKT 다이렉트": "browser",
+    "헬로모바일": "browser",
+    "SK 7세븐모바일": "browser",
+}
+HTTP_TIMEOUT = 10
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+FETCH_STATS_FILE = os.path.join(DATA_DIR, "fetch_stats.json")
+TITLE_CANDIDATES = ["h1", ".view-tit", ".event-view-title", ".board-view-title", "h2", ".subject", ".tit", ".v_title", ".dt_tit", ".board_view_tit"]
+
+# [V72] 델타 크롤링: 목록 항목(URL/링크 텍스트/썸네일) 지문이 같으면 상세 페이지 재방문 생략
+DELTA_CRAWL = os.environ.get("DELTA_CRAWL", "1") == "1"
+FULL_REFRESH_RUNS = int(os.environ.get("FULL_REFRESH_RUNS", "6"))      # N회마다 전체 재검증
+FULL_REFRESH_HOURS = float(os.environ.get("FULL_REFRESH_HOURS", "24"))  # 또는 마지막 전체 수집 후 N시간
+CRAWL_STATE_FILE = os.path.join(DATA_DIR, "crawl_state.json")
+
+# [V74] 노이즈 정규화 규칙: 기본 규칙 + noise_rules.json (global / 사이트별)
+NOISE_RULES_FILE = "noise_rules.json"
+NOISE_DEBUG = os.environ.get("NOISE_DEBUG") == "1"
+DEFAULT_NOISE_RULES = [
+    {"name": "view_count", "pattern": r'(조회|view|읽음)(수)?[\s:.]*[\d,]+', "ignore_case": True},
+    {"name": "visitor_count", "pattern": r'[\d,]+명의\s*고객님이\s*(구경|보고)'},
+    {"name": "clock", "pattern": r'\d{1,2}\s*[:시]\s*\d{1,2}(\s*[:분]\s*\d{1,2})?'},
+    {"name": "d_day", "pattern": r'D-[\dDay]+', "ignore_case": True},
+    {"name": "countdown", "pattern": r'\d+(일|시간|분|초)\s*(남음|남았|전|후)'},
+    {"name": "deadline_word", "pattern": r'(마감|종료|이벤트)\s*(까지)?'},
+    {"name": "loading", "pattern": r'Loading.*', "ignore_case": True},
+]
+
+# [V75] 본문 비교 예산: 청크 수 상한 초과 시 요약, 토큰 단위 정밀 비교는 시간/크기 한도 내에서만
+DIFF_MAX_CHUNKS = 3000
+DIFF_REFINE_LIMIT = 250000   # 교체 블록 토큰 수 곱 상한
+DIFF_TIME_BUDGET = 0.5       # 페이지당 초
+DIFF_CHUNK_TOKENS = 48
+
+# 사이트별 준비 조건 (selector: 요소 존재 / dom_stable: DOM 변화 멈춤 / network_idle: 요청 종료)
+# 지정이 없으면 dom_stable, 상세 페이지는 target_selector 가 있으면 selector 조건 추가
+SITE_READY_RULES = {
+    "SKT 다이렉트": {"list": {"selector": "#contents", "dom_stable": True}},
+    "SKT Air": {"list": {"selector": "#app > div > section.content", "network_idle": True}},
+    "U+ 유모바일": {"list": {"network_idle": True, "dom_stable": True}, "detail": {"network_idle": True, "dom_stable": True}},
+    "스카이라이프": {"list": {"network_idle": True, "dom_stable": True}},
+    "SK 7세븐모바일": {"list": {"selector": "#ct > section", "dom_stable": True}},
+}
+
+# [V83] 경량 브라우저 프로필: 사이트별 예외 (allow_types: 차단 해제할 자원 유형 / allow_hosts: 허용할 제3자 호스트)
+# 예: "U+ 유모바일": {"allow_hosts": ["static.example.com"]} — 스크립트가 외부 호스트에서 와야 렌더링되는 사이트
+# 제3자 호스트 DNS 차단은 모든 사이트가 여기 등록(검토)됐을 때만 적용, 예외가 없는 사이트도 {} 로 등록
+SITE_LOAD_PROFILE = {}
+LOAD_STATS_FILE = os.path.join(DATA_DIR, "load_profile_stats.json")
+
+# [V84] uc 가 패치한 chromedriver 를 보관해 재시작/다음 실행에서 다운로드·패치 생략 (교체 기준은 browser.DRIVER_MAX_*)
+UC_VERSION_MAIN = 144
+UC_DRIVER_CACHE = os.environ.get("UC_DRIVER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "competitor-monitor", f"chromedriver_{UC_VERSION_MAIN}"))
+
+# [V87] 썸네일 변경 판정: 64비트 dHash 의 다른 비트 수가 THUMB_DISTANCE 초과일 때만 변경 (해시가 없으면 URL 비교)
+THUMB_HASH = os.environ.get("THUMB_HASH", "1") == "1"
+THUMB_WORKERS = int(os.environ.get("THUMB_WORKERS", "8"))
+THUMB_DISTANCE = 10
+THUMB_MAX_BYTES = 5 * 1024 * 1024
+THUMB_CACHE_DIR = os.environ.get("THUMB_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "competitor-monitor", "thumbs"))
+THUMB_CACHE_MB = int(os.environ.get("THUMB_CACHE_MB", "200"))   # 초과 시 가장 오래 쓰지 않은 이미지부터 삭제
+
+# [V86] 사이트별 시간 예산 (초): 넘기면 수집을 멈추고 그때까지 모은 상세 페이지를 부분 결과로 저장
+SITE_BUDGET = float(os.environ.get("SITE_BUDGET", "300"))
+SITE_BUDGETS = {
+    "U+ 유모바일": 450,   # 상세 페이지 전부 브라우저 수집
+    "스카이라이프": 450,
+}
+PAGE_TIMEOUT = float(os.environ.get("PAGE_TIMEOUT", "30"))   # 페이지 1회 로드 상한 (Selenium 기본값 300초 대체)
+LIST_BUDGET_SHARE = float(os.environ.get("LIST_BUDGET_SHARE", "0.5"))   # 목록 단계가 쓸 수 있는 예산 비율 (나머지는 상세 수집 몫)
+
+# [V82] 실행 메트릭: 단계별 시간/바이트/재시도/삼킨 예외 → data/metrics/metrics_<ts>.json
+METRICS_DIR = os.path.join(DATA_DIR, "metrics")
+METRICS_SLACK = os.environ.get("METRICS_SLACK", "0") == "1"   # 슬랙 리포트에 요약 섹션 추가
 
 KST = timezone(timedelta(hours=9))
 NOW = datetime.now(KST)
@@ -54,6 +198,98 @@ EXCLUDE_URL_KEYWORDS = [
     "personInfo", "sktelink", "memberPolicy"
 ]
 EXCLUDE_TITLE_KEYWORDS = ["[종료]", "종료된", "당첨자", "발표", "개인정보", "이용약관"]
+# [V85] URL 정규화 시 제거할 추적용 쿼리 파라미터 (광고/분석 유입 표시, 페이지 내용과 무관)
+TRACKING_PARAM_RE = re.compile(r'^(utm_[a-z]+|gclid|dclid|fbclid|msclkid|igshid|_ga|_gl|mc_cid|mc_eid|NaPm|n_[a-z_]+)$', re.I)
+
+# =========================================================
+# [V82] 실행 메트릭 (스레드: 현재 사이트 컨텍스트 / 프로세스 풀: 작업별 수집 후 합산)
+# =========================================================
+_metrics_lock = threading.Lock()
+_metrics_ctx = threading.local()
+_run_start = time.monotonic()
+
+def new_metrics():
+    return {"stages": {}, "retries": {}, "errors": {}}
+
+_metrics = new_metrics()
+
+def _site_key(site):
+    return site or getattr(_metrics_ctx, "site", None) or "*"
+
+def record_stage(stage, sec, nbytes=0, site=None):
+    with _metrics_lock:
+        slot = _metrics["stages"].setdefault(stage, {}).setdefault(_site_key(site), {"count": 0, "sec": 0.0, "max_sec": 0.0, "bytes": 0})
+        slot["count"] += 1; slot["sec"] += sec; slot["bytes"] += nbytes
+        slot["max_sec"] = max(slot["max_sec"], sec)
+
+@contextmanager
+def stage_timer(stage, site=None):
+    # with stage_timer("list_page", name) as m: ...; m["bytes"] = len(html)
+    m, start = {"bytes": 0}, time.monotonic()
+    try: yield m
+    finally: record_stage(stage, time.monotonic() - start, m["bytes"], site)
+
+def count_retry(kind, site=None):
+    with _metrics_lock:
+        sites = _metrics["retries"].setdefault(kind, {})
+        sites[_site_key(site)] = sites.get(_site_key(site), 0) + 1
+
+def count_error(where, exc, site=None):
+    # except 로 삼키던 예외를 위치/사이트/예외 종류별로 집계
+    with _metrics_lock:
+        slot = _metrics["errors"].setdefault(where, {}).setdefault(_site_key(site), {"count": 0, "types": {}})
+        slot["count"] += 1
+        name = exc.__class__.__name__
+        slot["types"][name] = slot["types"].get(name, 0) + 1
+
+def merge_metrics(delta):
+    with _metrics_lock:
+        for stage, sites in delta["stages"].items():
+            for site, v in sites.items():
+                slot = _metrics["stages"].setdefault(stage, {}).setdefault(site, {"count": 0, "sec": 0.0, "max_sec": 0.0, "bytes": 0})
+                for k in ("count", "sec", "bytes"): slot[k] += v[k]
+                slot["max_sec"] = max(slot["max_sec"], v["max_sec"])
+        for kind, sites in delta["retries"].items():
+            for site, n in sites.items(): _metrics["retries"].setdefault(kind, {})[site] = _metrics["retries"].get(kind, {}).get(site, 0) + n
+        for where, sites in delta["errors"].items():
+            for site, v in sites.items():
+                slot = _metrics["errors"].setdefault(where, {}).setdefault(site, {"count": 0, "types": {}})
+                slot["count"] += v["count"]
+                for name, n in v["types"].items(): slot["types"][name] = slot["types"].get(name, 0) + n
+
+def metered_job(fn, *args):
+    # 프로세스 풀 워커의 메트릭은 부모에 보이지 않으므로 작업 중 쌓인 값을 결과와 함께 반환
+    global _metrics
+    saved, _metrics = _metrics, new_metrics()
+    try: return fn(*args), _metrics
+    finally: _metrics = saved
+
+def peak_rss_kb():
+    if resource is None: return {}
+    scale = 1024 if sys.platform == "darwin" else 1   # macOS 는 바이트 단위
+    return {"self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+            "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale}
+
+def metrics_snapshot(timestamp):
+    with _metrics_lock:
+        stages = {stage: {site: {**v, "sec": round(v["sec"], 3), "max_sec": round(v["max_sec"], 3)} for site, v in sites.items()} for stage, sites in _metrics["stages"].items()}
+        return {"run": timestamp, "total_sec": round(time.monotonic() - _run_start, 1), "peak_rss_kb": peak_rss_kb(),
+                "stages": stages, "retries": json.loads(json.dumps(_metrics["retries"])), "errors": json.loads(json.dumps(_metrics["errors"]))}
+
+def save_metrics(timestamp):
+    metrics = metrics_snapshot(timestamp)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    with open(os.path.join(METRICS_DIR, f"metrics_{timestamp}.json"), "w", encoding="utf-8") as f: json.dump(metrics, f, ensure_ascii=False, indent=1)
+    return metrics
+
+def metrics_slack_text(metrics):
+    totals = sorted(((stage, sum(v["sec"] for v in sites.values())) for stage, sites in metrics["stages"].items()), key=lambda x: -x[1])
+    errors = {where: sum(v["count"] for v in sites.values()) for where, sites in metrics["errors"].items()}
+    retries = sum(n for sites in metrics["retries"].values() for n in sites.values())
+    rss = metrics["peak_rss_kb"].get("self", 0) / 1024
+    lines = [f"⏱️ *실행 {metrics['total_sec']:.0f}s:* " + ", ".join(f"{stage} {sec:.0f}s" for stage, sec in totals[:5])]
+    lines.append(f"⚠️ *예외 {sum(errors.values())}건*" + (f" ({', '.join(f'{w} {n}' for w, n in sorted(errors.items(), key=lambda x: -x[1]))})" if errors else "") + f" · 재시도 {retries}건 · 최대 RSS {rss:.0f}MB")
+    return "\n".join(lines)
 
 # =========================================================
 # [유틸리티] 도구함
@@ -61,59 +297,457 @@ EXCLUDE_TITLE_KEYWORDS = ["[종료]", "종료된", "당첨자", "발표", "개
 def send_slack_alert(webhook_url, payload):
     if not webhook_url: return
     try:
-        requests.post(webhook_url, json=payload, headers={"Content-Type": "application/json"}, timeout=10)
-    except: pass
+        with stage_timer("slack_send"):
+            requests.post(webhook_url, json=payload, headers={"Content-Type": "application/json"}, timeout=10)
+    except Exception as e: count_error("slack_send", e)
+
+# =========================================================
+# [V76] 스냅샷 저장소: 본문은 해시 주소 blob 으로 1회만 저장, 실행별로는 manifest 만 기록
+# =========================================================
+BODY_KEYS = ("content", "text")
+
+def blob_path(blob_id):
+    return os.path.join(BLOB_DIR, blob_id[:2], f"{blob_id}.json.gz")
+
+def put_blob(body):
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    blob_id = hashlib.sha1(raw).hexdigest()
+    path = blob_path(blob_id)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        # mtime=0 → 같은 본문은 항상 같은 바이트 (git 변경 없음)
+        with open(tmp, "wb") as f: f.write(gzip.compress(raw, compresslevel=6, mtime=0))
+        os.replace(tmp, path)
+    return blob_id
+
+def get_blob(blob_id):
+    with open(blob_path(blob_id), "rb") as f: return json.loads(gzip.decompress(f.read()).decode("utf-8"))
+
+def snapshot_timestamp(path):
+    return re.sub(r'^(data|manifest)_', '', os.path.basename(path)).rsplit(".", 1)[0]
+
+def list_snapshots():
+    # (타임스탬프, 경로) 오름차순: 구버전 data_*.json 과 manifest_*.json 을 함께 정렬
+    # --delete 없이 마이그레이션하면 같은 시각이 두 벌 남으므로 타임스탬프당 하나, manifest 우선
+    runs = {}
+    for p in glob.glob(os.path.join(DATA_DIR, "data_*.json")) + glob.glob(os.path.join(SNAPSHOT_DIR, "manifest_*.json")):
+        runs[snapshot_timestamp(p)] = p
+    return sorted(runs.items())
+
+def save_snapshot(data, timestamp, status=None):
+    sites = {}
+    for name, pages in data.items():
+        sites[name] = {}
+        for url, entry in pages.items():
+            meta = {k: v for k, v in entry.items() if k not in BODY_KEYS}
+            meta["body"] = put_blob({k: entry[k] for k in BODY_KEYS if k in entry})
+            sites[name][url] = meta
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"manifest_{timestamp}.json")
+    with open(path, "w", encoding="utf-8") as f: json.dump({"version": 1, "timestamp": timestamp, "status": status or {}, "sites": sites}, f, ensure_ascii=False)
+    add_to_snapshot_index(path)
+    return path
+
+def resolve_manifest_sites(sites):
+    data = {}
+    for name, pages in sites.items():
+        data[name] = {}
+        for url, meta in pages.items():
+            entry = {k: v for k, v in meta.items() if k != "body"}
+            entry.update(get_blob(meta["body"]))
+            data[name][url] = entry
+    return data
+
+# =========================================================
+# [V77] 스냅샷 인덱스: 실행 시각 / 경쟁사별 URL 수·성공 여부·바이트 구간
+# =========================================================
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+
+def scan_json_object(text, start):
+    # text[start] 의 JSON 객체를 최상위 키 단위로 훑어 (키, 값, 시작, 끝) 문자 위치 반환
+    decoder, items = json.JSONDecoder(), []
+    i = _JSON_WS.match(text, start + 1).end()
+    while text[i] != '}':
+        key, i = decoder.raw_decode(text, i)
+        i = _JSON_WS.match(text, _JSON_WS.match(text, i).end() + 1).end()
+        value, end = decoder.raw_decode(text, i)
+        items.append((key, value, i, end))
+        i = _JSON_WS.match(text, end).end()
+        if text[i] == ',': i = _JSON_WS.match(text, i + 1).end()
+    return items
+
+def index_snapshot_file(path):
+    with open(path, "rb") as f: text = f.read().decode("utf-8")
+    top = scan_json_object(text, _JSON_WS.match(text).end())
+    fields = {k: (v, a, b) for k, v, a, b in top}
+    if "sites" in fields and "version" in fields:
+        fmt, status, sites = "manifest", fields.get("status", ({},))[0], scan_json_object(text, fields["sites"][1])
+    else: fmt, status, sites = "legacy", {}, top
+
+    entry, byte_pos, char_pos = {"ts": snapshot_timestamp(path), "path": path, "format": fmt, "sites": {}}, 0, 0
+    for name, pages, a, b in sites:
+        # 문자 위치 → UTF-8 바이트 위치 (순차 누적)
+        byte_pos += len(text[char_pos:a].encode("utf-8")); start = byte_pos
+        byte_pos += len(text[a:b].encode("utf-8")); char_pos = b
+        # 구버전은 상태 기록이 없으므로 수집 결과가 있으면 성공으로 간주
+        ok = status.get(name, "ok") == "ok" and len(pages) > 0
+        entry["sites"][name] = {"urls": len(pages), "ok": ok, "offset": [start, byte_pos]}
+        if status.get(name) == "partial": entry["sites"][name]["partial"] = True
+    entry["ok"] = bool(entry["sites"]) and all(s["ok"] for s in entry["sites"].values())
+    return entry
+
+def save_snapshot_index(index):
+    tmp = f"{SNAPSHOT_INDEX}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f: json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp, SNAPSHOT_INDEX)
+
+def rebuild_snapshot_index():
+    # 디렉터리 전체 스캔은 인덱스가 없을 때(또는 마이그레이션 후) 한 번만
+    index = {"version": 1, "runs": []}
+    for _, path in list_snapshots():
+        try: index["runs"].append(index_snapshot_file(path))
+        except Exception as e: print(f"⚠️ 스냅샷 인덱싱 실패: {path} ({e})")
+    save_snapshot_index(index)
+    return index
 
-def load_previous_data():
-    json_files = glob.glob(os.path.join(DATA_DIR, "data_*.json"))
-    if not json_files: return {}
-    json_files.sort()
-    latest_file = json_files[-1]
+def load_snapshot_index():
     try:
-        with open(latest_file, "r", encoding="utf-8") as f: return json.load(f)
+        with open(SNAPSHOT_INDEX, "r", encoding="utf-8") as f: return json.load(f)
+    except (FileNotFoundError, ValueError): return rebuild_snapshot_index()
+
+def add_to_snapshot_index(path):
+    index = load_snapshot_index()
+    entry = index_snapshot_file(path)
+    index["runs"] = [r for r in index["runs"] if r["ts"] != entry["ts"]]
+    index["runs"].append(entry)
+    index["runs"].sort(key=lambda r: r["ts"])
+    save_snapshot_index(index)
+
+def load_site_snapshot(run, name):
+    site = run["sites"].get(name)
+    if not site: return {}
+    start, end = site["offset"]
+    with open(run["path"], "rb") as f:
+        f.seek(start)
+        pages = json.loads(f.read(end - start).decode("utf-8"))
+    return resolve_manifest_sites({name: pages})[name] if run["format"] == "manifest" else pages
+
+def find_site_baseline(runs, name, at=None):
+    # at(YYYYmmdd_HHMMSS) 이전 실행 중 해당 경쟁사 수집이 성공한 가장 최근 실행 + 그 뒤의 부분 수집 실행들 (오래된 순)
+    end = bisect.bisect_right([r["ts"] for r in runs], at) if at else len(runs)
+    partials = []
+    for run in reversed(runs[:end]):
+        site = run["sites"].get(name, {})
+        if site.get("ok"): return run, partials[::-1]
+        if site.get("partial") and site.get("urls"): partials.append(run)
+    return None, partials[::-1]
+
+def parse_baseline_at(value):
+    if not value: return None
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y%m%d_%H%M%S"):
+        try: return datetime.strptime(value, fmt).strftime("%Y%m%d_%H%M%S")
+        except ValueError: pass
+    raise ValueError(f"BASELINE_AT 형식 오류: {value}")
+
+class BaselineSnapshot(dict):
+    """경쟁사 이름으로 처음 접근할 때 직전 성공 실행의 해당 구간만 읽어 오는 dict"""
+    def __init__(self, runs, at=None):
+        super().__init__()
+        self.runs, self.at, self.sources = runs, at, {}
+
+    def __missing__(self, name):
+        # [V86] 부분 수집 실행은 본 URL 만 덮어씀 (이미 알린 신규/변경은 다시 알리지 않고, 못 본 URL 은 성공 실행 기준 유지)
+        run, partials = find_site_baseline(self.runs, name, self.at)
+        latest = partials[-1] if partials else run
+        self.sources[name] = latest["ts"] if latest else None
+        pages = load_site_snapshot(run, name) if run else {}
+        for p in partials: pages = {**normalize_keys(pages), **normalize_keys(load_site_snapshot(p, name))}
+        self[name] = pages
+        return pages
+
+    def get(self, name, default=None):
+        pages = self[name]
+        return pages if self.sources.get(name, True) else default
+
+def load_baseline(at=None):
+    return BaselineSnapshot(load_snapshot_index()["runs"], at)
+
+def load_snapshot(path):
+    # manifest / 구버전 전체 JSON 모두 {경쟁사: {url: {title, img, content, ...}}} 형태로 반환
+    with open(path, "r", encoding="utf-8") as f: raw = json.load(f)
+    if isinstance(raw, dict) and raw.get("version") and "sites" in raw: return resolve_manifest_sites(raw["sites"])
+    return raw
+
+def list_fingerprint(url, link_text, thumb):
+    return hashlib.sha1(f"{url}\x1f{link_text}\x1f{thumb}".encode("utf-8")).hexdigest()[:16]
+
+def load_crawl_state():
+    try:
+        with open(CRAWL_STATE_FILE, "r", encoding="utf-8") as f: return json.load(f)
     except: return {}
 
-def calculate_similarity(text1, text2):
-    if not text1 or not text2: return 0.0
-    return difflib.SequenceMatcher(None, text1, text2).ratio()
+def use_delta_crawl(state):
+    # 전체 재검증 주기가 되면 델타 모드를 끄고 모든 상세 페이지를 다시 방문
+    if not DELTA_CRAWL or not state.get("last_full"): return False
+    if state.get("runs_since_full", 0) >= FULL_REFRESH_RUNS: return False
+    try: last_full = datetime.fromisoformat(state["last_full"])
+    except ValueError: return False
+    return NOW - last_full < timedelta(hours=FULL_REFRESH_HOURS)
+
+def save_crawl_state(state, delta):
+    if delta: state["runs_since_full"] = state.get("runs_since_full", 0) + 1
+    else: state.update(runs_since_full=0, last_full=NOW.isoformat(timespec="seconds"))
+    with open(CRAWL_STATE_FILE, "w", encoding="utf-8") as f: json.dump(state, f, ensure_ascii=False)
 
 # =========================================================
 # [핵심] 노이즈 제거
 # =========================================================
-def clean_noise(text):
+_noise_lock = threading.Lock()
+_noise_config = None
+_noise_engines = {}
+_noise_hits = {}
+
+def load_noise_config():
+    global _noise_config
+    if _noise_config is None:
+        try:
+            with open(NOISE_RULES_FILE, "r", encoding="utf-8") as f: _noise_config = json.load(f)
+        except FileNotFoundError: _noise_config = {}
+        except ValueError as e:
+            print(f"⚠️ {NOISE_RULES_FILE} 파싱 실패, 기본 규칙만 사용: {e}")
+            _noise_config = {}
+    return _noise_config
+
+_SRE_CATEGORY = {
+    sre_constants.CATEGORY_DIGIT: r'\d', sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_SPACE: r'\s', sre_constants.CATEGORY_NOT_SPACE: r'\S',
+    sre_constants.CATEGORY_WORD: r'\w', sre_constants.CATEGORY_NOT_WORD: r'\W',
+} if sre_constants else {}
+
+def _sre_nullable(items):
+    for op, av in items:
+        if op is sre_constants.AT: continue
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if av[0] == 0 or _sre_nullable(av[2]): continue
+        elif op is sre_constants.SUBPATTERN:
+            if _sre_nullable(av[-1]): continue
+        elif op is sre_constants.BRANCH:
+            if any(_sre_nullable(b) for b in av[1]): continue
+        return False
+    return True
+
+def _sre_first_chars(items, ignore_case):
+    # 패턴이 시작할 수 있는 문자 집합 (문자 클래스 조각), 판단 불가면 None
+    def literal(code):
+        ch = chr(code)
+        return {re.escape(ch.lower()), re.escape(ch.upper())} if ignore_case else {re.escape(ch)}
+    chars = set()
+    for op, av in items:
+        if op is sre_constants.AT: continue
+        if op is sre_constants.LITERAL: return chars | literal(av)
+        if op is sre_constants.IN:
+            for o, a in av:
+                if o is sre_constants.LITERAL: chars |= literal(a)
+                elif o is sre_constants.RANGE and not ignore_case: chars.add(f"{re.escape(chr(a[0]))}-{re.escape(chr(a[1]))}")
+                elif o is sre_constants.CATEGORY and a in _SRE_CATEGORY: chars.add(_SRE_CATEGORY[a])
+                else: return None
+            return chars
+        if op is sre_constants.SUBPATTERN: subs = [av[-1]]
+        elif op is sre_constants.BRANCH: subs = av[1]
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT): subs = [av[2]]
+        else: return None
+        for sub in subs:
+            first = _sre_first_chars(sub, ignore_case)
+            if first is None: return None
+            chars |= first
+        # 선택적 요소(반복 0회 등)면 다음 요소의 첫 문자도 포함
+        optional = op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] == 0
+        if not optional and not any(_sre_nullable(sub) for sub in subs): return chars
+    return None
+
+def first_char_class(pattern, ignore_case=False):
+    if sre_parse is None: return None
+    try: return _sre_first_chars(sre_parse.parse(pattern), ignore_case)
+    except Exception: return None
+
+_GROUP_REF = re.compile(r'(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\()')   # 숫자 역참조 \1, 조건 그룹 (?(1)...)
+
+def combinable(pattern, wrapped):
+    # 합친 alternation 안에서도 단독일 때와 같게 동작하는 규칙만 합침
+    # - 이름 그룹(규칙 간 중복) / 그룹 번호 참조(합치면 번호가 밀림)가 있으면 제외
+    # - 전역 인라인 플래그 (?i) 등: 3.11+ 는 중간 위치에서 컴파일 오류, 3.9 는 모든 규칙에 적용되므로 제외
+    try:
+        if re.compile(pattern).groupindex or _GROUP_REF.search(pattern): return False
+        return re.compile(f"(?P<r0>{wrapped})").flags == re.compile("(?P<r0>(?:x))").flags
+    except re.error: return False
+
+def compile_noise_rules(rules):
+    # 치환 문자열이 빈 규칙은 이름 그룹 alternation 하나로 합쳐 1회 스캔 (선언 순서 = 우선순위)
+    # 모든 규칙의 첫 문자 집합을 선행 lookahead 로 걸어 매칭 불가 위치는 바로 건너뜀
+    # 합칠 수 없는 제거 규칙은 합친 패턴 다음에 개별 실행 (치환 규칙보다는 먼저)
+    removal, sequential, replace, lead = [], [], [], set()
+    for rule in rules:
+        flags = re.I if rule.get("ignore_case") else 0
+        wrapped = ("(?i:" if rule.get("ignore_case") else "(?:") + rule["pattern"] + ")"
+        try: pattern = re.compile(rule["pattern"], flags)
+        except re.error as e:
+            print(f"⚠️ 노이즈 규칙 '{rule.get('name')}' 컴파일 실패: {e}")
+            continue
+        if rule.get("repl"):
+            replace.append((rule["name"], pattern, rule["repl"]))
+            continue
+        if not combinable(rule["pattern"], wrapped):
+            sequential.append((rule["name"], pattern, ""))
+            continue
+        removal.append((rule["name"], wrapped))
+        first = first_char_class(rule["pattern"], rule.get("ignore_case"))
+        lead = None if first is None or lead is None else lead | first
+    combined = None
+    if removal:
+        body = "|".join(f"(?P<r{i}>{p})" for i, (_, p) in enumerate(removal))
+        try: combined = re.compile(f"(?=[{''.join(sorted(lead))}])(?:{body})" if lead else body)
+        except re.error as e:
+            # 합친 패턴이 깨지면 모든 제거 규칙을 개별 실행 (선언 순서 유지)
+            print(f"⚠️ 노이즈 규칙 통합 컴파일 실패, 개별 적용: {e}")
+            sequential = [(name, re.compile(p), "") for name, p in removal] + sequential
+            removal = []
+    return {"combined": combined, "names": [n for n, _ in removal], "replace": sequential + replace}
+
+def noise_engine(site_name=None):
+    with _noise_lock:
+        engine = _noise_engines.get(site_name)
+        if engine is None:
+            config = load_noise_config()
+            rules = DEFAULT_NOISE_RULES + config.get("global", [])
+            if site_name: rules = rules + config.get("sites", {}).get(site_name, [])
+            engine = _noise_engines[site_name] = compile_noise_rules(rules)
+        return engine
+
+def _record_noise_hit(site_name, rule_name, removed):
+    with _noise_lock:
+        hit = _noise_hits.setdefault((site_name or "global", rule_name), {"count": 0, "samples": []})
+        hit["count"] += 1
+        if len(hit["samples"]) < 3 and removed.strip(): hit["samples"].append(removed.strip()[:40])
+
+def clean_noise(text, site_name=None):
     if not text: return ""
-    text = re.sub(r'(조회|view|읽음)(수)?[\s:.]*[\d,]+', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'[\d,]+명의\s*고객님이\s*(구경|보고)', '', text)
-    text = re.sub(r'\d{1,2}\s*[:시]\s*\d{1,2}(\s*[:분]\s*\d{1,2})?', '', text)
-    text = re.sub(r'D-[\dDay]+', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\d+(일|시간|분|초)\s*(남음|남았|전|후)', '', text)
-    text = re.sub(r'(마감|종료|이벤트)\s*(까지)?', '', text)
-    text = re.sub(r'Loading.*', '', text, flags=re.IGNORECASE)
+    engine = noise_engine(site_name)
+    if engine["combined"]:
+        if NOISE_DEBUG:
+            def drop(m):
+                _record_noise_hit(site_name, engine["names"][int(m.lastgroup[1:])], m.group())
+                return ''
+            text = engine["combined"].sub(drop, text)
+        else: text = engine["combined"].sub('', text)
+    for name, pattern, repl in engine["replace"]:
+        if NOISE_DEBUG:
+            for m in pattern.finditer(text): _record_noise_hit(site_name, name, m.group())
+        text = pattern.sub(repl, text)
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-def clean_html(html_source):
-    if not html_source: return ""
-    soup = BeautifulSoup(html_source, 'html.parser')
-    for tag in soup(['script', 'style', 'meta', 'noscript', 'header', 'footer', 'iframe', 'button', 'input', 'nav', 'aside', 'link', 'form']):
+def noise_debug_report():
+    with _noise_lock: hits = sorted(_noise_hits.items(), key=lambda kv: -kv[1]["count"])
+    for (scope, name), hit in hits: print(f"🧹 [{scope}] {name}: {hit['count']}회 제거 (예: {' | '.join(hit['samples'])})")
+
+def strip_page(node):
+    for tag in node(['script', 'style', 'meta', 'noscript', 'header', 'footer', 'iframe', 'button', 'input', 'nav', 'aside', 'link', 'form']):
         tag.decompose()
-    return soup.body.prettify() if soup.body else soup.prettify()
+    return node.body if node.body else node
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] if text else ""
+
+def page_from_node(node):
+    # [V73] 파싱된 노드 하나에서 정제 HTML / 본문 텍스트 / 해시를 함께 생성
+    node = strip_page(node)
+    text = node.get_text(separator=" ", strip=True)
+    return {"content": node.prettify(), "text": text, "hash": text_hash(text)}
+
+def extract_page(html_source):
+    if not html_source: return {"content": "", "text": "", "hash": ""}
+    return page_from_node(BeautifulSoup(html_source, HTML_PARSER))
+
+def clean_html(html_source):
+    return extract_page(html_source)["content"]
 
 def get_clean_text(html_content):
     if not html_content: return ""
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = BeautifulSoup(html_content, HTML_PARSER)
     return soup.get_text(separator=" ", strip=True)
 
+def body_texts(prev, curr):
+    # 저장된 정제 텍스트가 양쪽에 있으면 재파싱 없이 사용, 구버전 스냅샷이면 content 에서 동일 방식으로 추출
+    if prev.get('text') is not None and curr.get('text') is not None: return prev['text'], curr['text']
+    return get_clean_text(prev.get('content', '')), get_clean_text(curr.get('content', ''))
+
+# =========================================================
+# [V75] 본문 비교 엔진 (해시 → 청크 → 토큰 2단계)
+# =========================================================
+TOKEN_RE = re.compile(r'\S+\s*|\s+')
+SENTENCE_END_RE = re.compile(r'[.!?。]\s*$')
+
+def split_tokens(text, base=0):
+    # (토큰, 시작 오프셋) 목록: 이어 붙이면 원문과 동일
+    return [(m.group(), base + m.start()) for m in TOKEN_RE.finditer(text)]
+
+def split_chunks(text):
+    # 문장 끝 또는 내용 기반 경계(crc32)에서 끊어, 앞부분 삽입이 뒤 청크 경계를 밀지 않도록 함
+    chunks, starts, buf, start = [], [], [], 0
+    for tok, pos in split_tokens(text):
+        if not buf: start = pos
+        buf.append(tok)
+        if SENTENCE_END_RE.search(tok) or zlib.crc32(tok.strip().encode("utf-8")) & 7 == 0 or len(buf) >= DIFF_CHUNK_TOKENS:
+            chunks.append("".join(buf)); starts.append(start); buf = []
+    if buf: chunks.append("".join(buf)); starts.append(start)
+    starts.append(len(text))
+    return chunks, starts
+
+def _refine_block(old_text, new_text, i1, i2, j1, j2):
+    a, b = split_tokens(old_text[i1:i2], i1), split_tokens(new_text[j1:j2], j1)
+    if len(a) * len(b) > DIFF_REFINE_LIMIT: return None
+    a_ends, b_ends = [p for _, p in a] + [i2], [p for _, p in b] + [j2]
+    matcher = difflib.SequenceMatcher(None, [t for t, _ in a], [t for t, _ in b])
+    return [(tag, a_ends[x1], a_ends[x2], b_ends[y1], b_ends[y2]) for tag, x1, x2, y1, y2 in matcher.get_opcodes()]
+
+def diff_texts(old_text, new_text):
+    # 결과 opcodes(문자 오프셋)는 변경 판정과 HTML 렌더링에 함께 사용
+    if old_text == new_text: return {"changed": False, "opcodes": [("equal", 0, len(old_text), 0, len(new_text))], "summary": ""}
+    a_chunks, a_starts = split_chunks(old_text)
+    b_chunks, b_starts = split_chunks(new_text)
+    if len(a_chunks) > DIFF_MAX_CHUNKS or len(b_chunks) > DIFF_MAX_CHUNKS:
+        kept = len(set(a_chunks) & set(b_chunks))
+        summary = f"본문 대폭 변경 (이전 {len(old_text):,}자 → 현재 {len(new_text):,}자, 유지된 문단 {kept}/{len(a_chunks)})"
+        return {"changed": True, "opcodes": [], "summary": summary}
+
+    deadline = time.monotonic() + DIFF_TIME_BUDGET
+    opcodes = []
+    for tag, x1, x2, y1, y2 in difflib.SequenceMatcher(None, a_chunks, b_chunks).get_opcodes():
+        i1, i2, j1, j2 = a_starts[x1], a_starts[x2], b_starts[y1], b_starts[y2]
+        if tag == 'replace' and time.monotonic() < deadline:
+            refined = _refine_block(old_text, new_text, i1, i2, j1, j2)
+            if refined: opcodes.extend(refined); continue
+        opcodes.append((tag, i1, i2, j1, j2))
+    changed = any(tag != 'equal' for tag, *_ in opcodes)
+    return {"changed": changed, "opcodes": opcodes, "summary": ""}
+
 # =========================================================
 # [시각화] 변경사항 리포트 생성
 # =========================================================
-def generate_diff_view(old_text, new_text):
-    matcher = difflib.SequenceMatcher(None, old_text, new_text)
+def render_diff_html(old_text, new_text, result):
+    if not result["changed"]: return ""
+    if result["summary"]:
+        return f"""
+    <div style="margin-top:10px; border:1px solid #eee; border-radius:5px; overflow:hidden;">
+        <div style="background:#fffcf5; padding:8px; color:#e67e22; font-size:12px;"><b>[요약]</b> {html.escape(result['summary'])}</div>
+    </div>
+    """
     old_html = []
     new_html = []
     has_change = False
     
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in result["opcodes"]:
         if tag == 'equal':
             content = html.escape(old_text[i1:i2])
             if len(content) > 50: content = content[:25] + " ... " + content[-25:]
@@ -143,40 +777,419 @@ def generate_diff_view(old_text, new_text):
     </div>
     """
 
-def check_update_same_url(prev, curr):
+def generate_diff_view(old_text, new_text):
+    return render_diff_html(old_text, new_text, diff_texts(old_text, new_text))
+
+def check_update_same_url(prev, curr, site_name=None):
     reasons = []
     diff_html = ""
     
-    if prev.get('title', '').strip() != curr.get('title', '').strip():
+    if clean_title(prev.get('title')) != clean_title(curr.get('title')):
         reasons.append("제목 변경")
         diff_html += f"<div style='margin-bottom:8px;'><b>제목:</b> {prev.get('title')} <span style='color:blue;'>▶</span> <b>{curr.get('title')}</b></div>"
     
-    p_clean, c_clean = clean_noise(get_clean_text(prev.get('content', ''))), clean_noise(get_clean_text(curr.get('content', '')))
-    if p_clean and c_clean and calculate_similarity(p_clean, c_clean) < 1.0:
-        reasons.append("본문 수정")
-        diff_html += generate_diff_view(p_clean, c_clean)
+    same_body = bool(prev.get('hash')) and prev.get('hash') == curr.get('hash')
+    if not same_body:
+        with stage_timer("normalize", site_name):
+            p_text, c_text = body_texts(prev, curr)
+            p_clean, c_clean = clean_noise(p_text, site_name), clean_noise(c_text, site_name)
+        with stage_timer("diff", site_name):
+            result = diff_texts(p_clean, c_clean) if p_clean and c_clean else None
+            if result and result["changed"]:
+                reasons.append("본문 수정")
+                diff_html += render_diff_html(p_clean, c_clean, result)
         
-    if prev.get('img', '').strip() != curr.get('img', '').strip():
+    if thumb_changed(prev, curr):
         reasons.append("썸네일 변경")
         
     return {"msg": f"{', '.join(reasons)}", "html": diff_html} if reasons else None
 
+def load_browser_modules():
+    global uc, By, WebDriverWait, EC, TimeoutException
+    if uc is not None: return
+    import undetected_chromedriver as _uc
+    from selenium.webdriver.common.by import By as _By
+    from selenium.webdriver.support.ui import WebDriverWait as _WebDriverWait
+    from selenium.webdriver.support import expected_conditions as _EC
+    from selenium.common.exceptions import TimeoutException as _TimeoutException
+    uc, By, WebDriverWait, EC, TimeoutException = _uc, _By, _WebDriverWait, _EC, _TimeoutException
+
+# =========================================================
+# [V86] 사이트 시간 예산: 스레드별 마감 시각, 페이지 한도는 min(기본 한도, 남은 예산)
+# =========================================================
+_deadline_ctx = threading.local()
+
+class SiteTimeout(Exception):
+    """사이트 시간 예산 소진 (수집한 결과는 부분 결과로 유지)"""
+
+def start_deadline(site_name):
+    _deadline_ctx.budget = SITE_BUDGETS.get(site_name, SITE_BUDGET)
+    _deadline_ctx.until = time.monotonic() + _deadline_ctx.budget
+    # 목록 단계 상한: 목록이 예산을 다 써서 상세를 하나도 못 받는 일이 없도록
+    _deadline_ctx.list_until = time.monotonic() + _deadline_ctx.budget * LIST_BUDGET_SHARE
+    _deadline_ctx.partial = False
+
+def end_list_phase():
+    # 목록을 일찍 끝내면 남은 시간은 모두 상세 수집에 사용
+    _deadline_ctx.list_until = None
+
+def page_deadline(default):
+    until = getattr(_deadline_ctx, "until", None)
+    if until is None: return default
+    list_until = getattr(_deadline_ctx, "list_until", None)
+    if list_until is not None and list_until < until:
+        left = list_until - time.monotonic()
+        if left <= 0: raise SiteTimeout(f"목록 예산 {_deadline_ctx.budget * LIST_BUDGET_SHARE:.0f}s 소진")
+        return min(default, left)
+    left = until - time.monotonic()
+    if left <= 0: raise SiteTimeout(f"예산 {_deadline_ctx.budget:.0f}s 소진")
+    return min(default, left)
+
+def mark_partial(site_name, reason):
+    if not getattr(_deadline_ctx, "partial", False): print(f"⏱️ [{site_name}] 수집 중단, 부분 결과로 저장: {reason}")
+    _deadline_ctx.partial = True
+
+def navigate(driver, url):
+    driver.set_page_load_timeout(page_deadline(PAGE_TIMEOUT))
+    driver.get(replay.route(url))
+
+# =========================================================
+# [V70] 페이지 준비 대기 (고정 sleep 대체)
+# =========================================================
+# fetch/XHR 진행 중 요청 수를 세는 훅 (문서 생성 시점에 주입)
+NETWORK_TRACKER_JS = """
+(function() {
+    if (window.__cmPending !== undefined) return;
+    window.__cmPending = 0;
+    var origFetch = window.fetch;
+    if (origFetch) window.fetch = function() {
+        window.__cmPending++;
+        return origFetch.apply(window, arguments).finally(function() { window.__cmPending--; });
+    };
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__cmPending++;
+        this.addEventListener('loadend', function() { window.__cmPending--; });
+        return origSend.apply(this, arguments);
+    };
+})();
+"""
+DOM_PROBE_JS = "return document.getElementsByTagName('*').length + ':' + (document.body ? document.body.innerHTML.length : 0);"
+NETWORK_PROBE_JS = "return (window.__cmPending || 0) > 0 ? null : performance.getEntriesByType('resource').length;"
+
+_latency_lock = threading.Lock()
+_load_latency = None
+
+def _latency_samples(site_name, kind):
+    global _load_latency
+    if _load_latency is None:
+        try:
+            with open(LATENCY_FILE, "r", encoding="utf-8") as f: _load_latency = json.load(f)
+        except: _load_latency = {}
+    return _load_latency.setdefault(site_name, {}).setdefault(kind, [])
+
+def record_load_latency(site_name, kind, seconds):
+    with _latency_lock:
+        samples = _latency_samples(site_name, kind)
+        samples.append(round(seconds, 2))
+        del samples[:-LATENCY_SAMPLES]
+
+def ready_timeout(site_name, kind):
+    with _latency_lock: samples = sorted(_latency_samples(site_name, kind))
+    if len(samples) < 3: return READY_DEFAULT_TIMEOUT
+    p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+    return min(READY_MAX_TIMEOUT, max(READY_MIN_TIMEOUT, p90 * 2 + 2))
+
+def save_load_latency():
+    with _latency_lock:
+        # 재생 서버의 지연은 실제 사이트 특성이 아니므로 학습값에 반영하지 않음
+        if not _load_latency or replay.REPLAY_MODE == "replay": return
+        with open(LATENCY_FILE, "w", encoding="utf-8") as f: json.dump(_load_latency, f, ensure_ascii=False)
+
+def _quiet_condition(script):
+    # 값이 READY_QUIET 동안 변하지 않으면 준비 완료 (None 은 아직 바쁜 상태)
+    state = {"value": None, "since": 0.0}
+    def check(driver):
+        value, now = driver.execute_script(script), time.monotonic()
+        if value is None or value != state["value"]:
+            state["value"], state["since"] = value, now
+            return False
+        return now - state["since"] >= READY_QUIET
+    return check
+
+def wait_until_ready(driver, site_name, kind, selector=None):
+    rule = dict(SITE_READY_RULES.get(site_name, {}).get(kind) or {"dom_stable": True})
+    if selector and not rule.get("selector"): rule["selector"] = selector
+    conditions = []
+    if rule.get("selector"): conditions.append(("selector", EC.presence_of_element_located((By.CSS_SELECTOR, rule["selector"]))))
+    if rule.get("network_idle"): conditions.append(("network_idle", _quiet_condition(NETWORK_PROBE_JS)))
+    if rule.get("dom_stable"): conditions.append(("dom_stable", _quiet_condition(DOM_PROBE_JS)))
+
+    timeout = page_deadline(ready_timeout(site_name, kind))
+    start = time.monotonic()
+    for name, cond in conditions:
+        remaining = timeout - (time.monotonic() - start)
+        try:
+            if remaining <= 0: raise TimeoutException()
+            WebDriverWait(driver, remaining, poll_frequency=READY_POLL).until(cond)
+        except TimeoutException as e:
+            count_error(f"ready_timeout_{kind}", e, site_name)
+            # 타임아웃도 표본으로 남겨 다음 실행의 대기 한도를 늘림
+            record_load_latency(site_name, kind, timeout)
+            print(f"⏱️ [{site_name}] {kind} 준비 조건 '{name}' 타임아웃 ({timeout:.1f}s): {driver.current_url}")
+            return False
+    record_load_latency(site_name, kind, time.monotonic() - start)
+    return True
+
+# =========================================================
+# [V71] 상세 페이지 수집: HTTP 우선 + 브라우저 폴백
+# =========================================================
+_http_lock = threading.Lock()
+_http_session = None
+_fetch_stats = {}
+_known_titles = {}   # 이전 실행의 URL별 제목: HTTP 로 받은 제목이 다르면 브라우저로 재확인
+
+def get_http_session():
+    # 호스트별 keep-alive 커넥션을 재사용하는 공용 세션 (urllib3 풀은 스레드 안전)
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(CRAWL_WORKERS * 2, THUMB_WORKERS), max_retries=1)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(HTTP_HEADERS)
+            _http_session = session
+        return _http_session
+
+def clean_title(text):
+    # HTTP(get_text) / 브라우저(.text) 경로의 공백·줄바꿈 차이로 '제목 변경'이 나지 않도록 통일
+    return " ".join((text or "").split())
+
+_HIDDEN_STYLE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.I)
+
+def static_visible(node):
+    # 정적 HTML 로 알 수 있는 숨김만 확인 (hidden / aria-hidden / 인라인 style), 클래스로 숨긴 요소는 알 수 없음
+    for el in [node, *node.parents]:
+        attrs = getattr(el, "attrs", None) or {}
+        if "hidden" in attrs or attrs.get("aria-hidden") == "true" or _HIDDEN_STYLE.search(attrs.get("style", "")): return False
+    return True
+
+def fetch_detail_http(url, target_selector):
+    with stage_timer("detail_http") as m:
+        resp = get_http_session().get(replay.route(url), timeout=page_deadline(HTTP_TIMEOUT))
+        m["bytes"] = len(resp.content)
+    if not resp.encoding or resp.encoding.lower() == "iso-8859-1": resp.encoding = resp.apparent_encoding
+    replay.record(url, resp.text, resp.status_code, resp.headers.get("Content-Type", "text/html").split(";")[0])
+    if resp.status_code != 200: return None
+    with stage_timer("parse"): soup = BeautifulSoup(resp.text, HTML_PARSER)
+
+    # 브라우저 경로와 같이 후보별 첫 요소만 보고, 숨긴 요소면(.text 가 빈 문자열) 다음 후보로
+    title = ""
+    for t_sel in TITLE_CANDIDATES:
+        node = soup.select_one(t_sel)
+        title = clean_title(node.get_text(" ")) if node and static_visible(node) else ""
+        if title: break
+
+    # 검증: target_selector 가 있으면 해당 영역, 없으면 제목 후보가 정적 HTML 에 있어야 함
+    area = soup.select_one(target_selector) if target_selector else soup
+    if not area or (not target_selector and not title): return None
+    if not title and soup.title: title = clean_title(soup.title.get_text())
+    with stage_timer("parse"): page = page_from_node(area)
+    # 영역 껍데기만 있고 본문은 스크립트로 채우는 페이지 → 브라우저로 재수집
+    if not page["text"]: return None
+    return {"title": title, **page}
+
+def fetch_detail_browser(driver, site_name, url, target_selector):
+    with stage_timer("detail_browser", site_name) as m:
+        navigate(driver, url); wait_until_ready(driver, site_name, "detail", target_selector)
+        source = driver.page_source
+        m["bytes"] = len(source.encode("utf-8"))
+    browser.log_page(driver, site_name, url)
+    replay.record(url, source, rendered=True)
+    with stage_timer("parse", site_name):
+        try: page = extract_page(driver.find_element(By.CSS_SELECTOR, target_selector).get_attribute('outerHTML')) if target_selector else extract_page(source)
+        except Exception as e:
+            count_error("detail_selector", e, site_name)
+            page = extract_page(source)
+
+    title = ""
+    for t_sel in TITLE_CANDIDATES:
+        try: 
+            title = clean_title(driver.find_element(By.CSS_SELECTOR, t_sel).text)
+            if title: break
+        except: pass
+    if not title: title = clean_title(driver.title)
+    return {"title": title, **page}
+
+def fetch_detail(driver, site_name, url, target_selector):
+    mode = SITE_FETCH_MODE.get(site_name, FETCH_MODE)
+    start, page, served = time.monotonic(), None, "browser"
+    if mode in ("auto", "http"):
+        try: page, served = fetch_detail_http(url, target_selector), "http"
+        except SiteTimeout: raise
+        except Exception as e:
+            count_error("detail_http", e, site_name)
+            print(f"⚠️ [{site_name}] HTTP 수집 실패: {url} ({e.__class__.__name__})")
+        # 정적 HTML 에서 고른 제목이 지난번(브라우저 포함) 제목과 다르면 숨김 요소일 수 있으므로 브라우저 결과 사용
+        known = _known_titles.get(url)
+        if page and mode == "auto" and known is not None and clean_title(known) != page["title"]:
+            count_retry("detail_title_mismatch", site_name)
+            page = None
+    if page is None and mode != "http":
+        served = "fallback" if mode == "auto" else "browser"
+        if mode == "auto": count_retry("detail_browser_fallback", site_name)
+        page = fetch_detail_browser(driver, site_name, url, target_selector)
+    with _http_lock: _fetch_stats[url] = {"site": site_name, "mode": served if page else "failed", "sec": round(time.monotonic() - start, 2)}
+    return page
+
+def save_fetch_stats():
+    with _http_lock: stats = dict(_fetch_stats)
+    if not stats: return
+    summary = {}
+    for st in stats.values():
+        modes = summary.setdefault(st['site'], {})
+        modes[st['mode']] = modes.get(st['mode'], 0) + 1
+    for site, modes in summary.items(): print(f"📡 [{site}] 상세 수집 방식: {', '.join(f'{m} {n}' for m, n in modes.items())}")
+    with open(FETCH_STATS_FILE, "w", encoding="utf-8") as f: json.dump({"run": FILE_TIMESTAMP, "summary": summary, "urls": stats}, f, ensure_ascii=False)
+
+# =========================================================
+# [V87] 썸네일 지각 해시: 풀링된 HTTP 세션으로 동시 다운로드, URL 별 ETag/Last-Modified 캐시
+# =========================================================
+_thumb_lock = threading.Lock()
+_thumb_index = None
+
+def thumb_index():
+    # {이미지 URL: {etag, modified, hash, size, file, used}} (호출부에서 _thumb_lock 보유)
+    global _thumb_index
+    if _thumb_index is None:
+        try:
+            with open(os.path.join(THUMB_CACHE_DIR, "index.json"), "r", encoding="utf-8") as f: _thumb_index = json.load(f)
+        except: _thumb_index = {}
+    return _thumb_index
+
+def image_dhash(raw):
+    # 9x8 흑백 축소 후 가로로 이웃한 픽셀 밝기 비교 (재압축/리사이즈에는 둔감, 다른 배너면 크게 달라짐)
+    with Image.open(io.BytesIO(raw)) as img:
+        img.draft("L", (64, 64))
+        px = list(img.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8): bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+def thumb_distance(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+def thumb_changed(prev, curr):
+    p_hash, c_hash = prev.get('img_hash'), curr.get('img_hash')
+    if p_hash and c_hash: return thumb_distance(p_hash, c_hash) > THUMB_DISTANCE
+    return prev.get('img', '').strip() != curr.get('img', '').strip()
+
+def fetch_thumb_hash(url):
+    # 바뀌지 않은 이미지는 304 로 캐시된 해시 재사용, 네트워크 실패 시에도 캐시된 해시 사용
+    with _thumb_lock: cached = dict(thumb_index().get(url) or {})
+    headers = {}
+    if cached.get("hash") and cached.get("etag"): headers["If-None-Match"] = cached["etag"]
+    if cached.get("hash") and cached.get("modified"): headers["If-Modified-Since"] = cached["modified"]
+    try:
+        with stage_timer("thumb_fetch") as m:
+            resp = get_http_session().get(replay.route(url), headers=headers, timeout=HTTP_TIMEOUT)
+            m["bytes"] = len(resp.content)
+    except Exception as e:
+        count_error("thumb_fetch", e)
+        return cached.get("hash")
+
+    if resp.status_code == 304 and cached.get("hash"): meta = cached
+    elif resp.status_code == 200 and resp.content and len(resp.content) <= THUMB_MAX_BYTES:
+        replay.record(url, resp.content, 200, resp.headers.get("Content-Type", "image/jpeg").split(";")[0])
+        try: img_hash = image_dhash(resp.content)
+        except Exception as e:
+            count_error("thumb_decode", e)   # SVG 등 디코딩 불가 → URL 비교
+            return None
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        rel = os.path.join(key[:2], key)
+        os.makedirs(os.path.join(THUMB_CACHE_DIR, key[:2]), exist_ok=True)
+        with open(os.path.join(THUMB_CACHE_DIR, rel), "wb") as f: f.write(resp.content)
+        meta = {"etag": resp.headers.get("ETag"), "modified": resp.headers.get("Last-Modified"), "hash": img_hash, "size": len(resp.content), "file": rel}
+    else: return None
+    meta["used"] = time.time()
+    with _thumb_lock: thumb_index()[url] = meta
+    return meta["hash"]
+
+def save_thumb_cache():
+    with _thumb_lock:
+        index, total = thumb_index(), 0
+        for url, meta in sorted(index.items(), key=lambda kv: -kv[1].get("used", 0)):
+            total += meta.get("size", 0)
+            if total <= THUMB_CACHE_MB * 1024 * 1024: continue
+            try: os.remove(os.path.join(THUMB_CACHE_DIR, meta["file"]))
+            except OSError: pass
+            del index[url]
+        os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+        tmp = os.path.join(THUMB_CACHE_DIR, "index.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(index, f)
+        os.replace(tmp, os.path.join(THUMB_CACHE_DIR, "index.json"))
+
+def hash_thumbnails(today):
+    # 수집 직후 모든 항목에 img_hash 기록 (같은 URL 의 배너 교체도 잡도록 매 실행 조건부 요청으로 재확인)
+    if not THUMB_HASH: return
+    if Image is None:
+        print("⚠️ Pillow 미설치: 썸네일은 URL 로 비교")
+        return
+    urls = sorted({d['img'] for pages in today.values() for d in pages.values() if d.get('img', '').startswith("http")})
+    if not urls: return
+    with ThreadPoolExecutor(max_workers=THUMB_WORKERS) as executor: hashes = dict(zip(urls, executor.map(fetch_thumb_hash, urls)))
+    for pages in today.values():
+        for d in pages.values():
+            img_hash = hashes.get(d.get('img', ''))
+            if img_hash: d['img_hash'] = img_hash
+            else: d.pop('img_hash', None)
+    save_thumb_cache()
+    print(f"🖼️ 썸네일 {len(urls)}개 중 {sum(1 for h in hashes.values() if h)}개 해시 계산")
+
 # =========================================================
 # [크롤러] 목록 기반 수집 로직
 # =========================================================
-def setup_driver():
+def setup_driver(hosts=(), allow_hosts=(), block_dns=False):
+    load_browser_modules()
     options = uc.ChromeOptions()
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1920,1080")
-    return uc.Chrome(options=options, version_main=144)
+    browser.chrome_options(options, hosts, allow_hosts, block_dns)
+    cached = os.path.exists(UC_DRIVER_CACHE)
+    driver = uc.Chrome(options=options, version_main=UC_VERSION_MAIN, **({"driver_executable_path": UC_DRIVER_CACHE} if cached else {}))
+    if not cached:
+        try:
+            os.makedirs(os.path.dirname(UC_DRIVER_CACHE), exist_ok=True)
+            shutil.copy2(driver.patcher.executable_path, UC_DRIVER_CACHE + ".tmp")
+            os.replace(UC_DRIVER_CACHE + ".tmp", UC_DRIVER_CACHE)
+        except Exception as e: count_error("driver_cache", e)
+    try: driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})
+    except: pass
+    return driver
 
-def extract_list_with_thumbnails(driver, site_name, keyword_list, onclick_pattern=None, base_url="", target_selector=None):
-    targets = {}
+# [V85] 크롤 프론티어: URL 정규화 → 목록 전 페이지 중복 제거 → 제외 규칙 → 상세 수집 (URL 당 1회)
+def normalize_url(url):
+    # 추적 파라미터/프래그먼트 제거 (#/, #! 해시 라우트는 페이지 구분용이므로 유지), 나머지 쿼리는 원문 그대로
+    parts = urlsplit(url.strip())
+    query = "&".join(kv for kv in parts.query.split("&") if kv and not TRACKING_PARAM_RE.match(kv.split("=", 1)[0]))
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, fragment))
+
+def normalize_keys(pages):
+    # 이전 스냅샷도 같은 키로 비교 (정규화 전 저장된 URL 대응), 충돌 시 먼저 나온 항목 유지
+    normalized = {}
+    for url, data in pages.items(): normalized.setdefault(normalize_url(url), data)
+    return normalized
+
+def extract_list_links(driver, site_name, keyword_list, onclick_pattern=None, base_url=""):
+    # 현재 목록 페이지의 상세 링크 후보 {정규화 URL: {thumb, text}} (상세 방문/제외 규칙 적용 전)
+    links = {}
     try:
-        time.sleep(3)
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        with stage_timer("parse_list", site_name): soup = BeautifulSoup(driver.page_source, HTML_PARSER)
         
         if site_name == "SK 7세븐모바일":
             area = soup.select_one("#ct > section")
@@ -199,49 +1212,74 @@ def extract_list_with_thumbnails(driver, site_name, keyword_list, onclick_patter
                 if seq: final_url = f"https://www.ktmmobile.com/event/eventDetail.do?ntcartSeq={seq}"
             
             if final_url:
-                if any(bad in final_url for bad in EXCLUDE_URL_KEYWORDS): continue
-                link_text = link.get_text()
-                if any(bad in link_text for bad in EXCLUDE_TITLE_KEYWORDS): continue
-
                 img = link.find('img')
                 if not img:
                     try: img = link.find_parent().find('img') 
                     except: pass
                 
                 thumb = urljoin(base_url, img.get('src') or img.get('data-src')) if img else ""
-                if final_url not in targets or (thumb and not targets[final_url]): targets[final_url] = thumb
-    except: pass
-    
+                link_text = " ".join(link.get_text().split())
+                url = normalize_url(final_url)
+                if url not in links: links[url] = {"thumb": thumb, "text": link_text}
+                elif thumb and not links[url]['thumb']: links[url]['thumb'] = thumb
+    except Exception as e: count_error("list_parse", e, site_name)
+    return links
+
+def merge_frontier(frontier, links):
+    # 새로 발견한 URL 수 반환 (이미 있는 URL 은 비어 있던 썸네일만 보충)
+    added = 0
+    for url, entry in links.items():
+        if url not in frontier:
+            frontier[url] = entry; added += 1
+        elif entry['thumb'] and not frontier[url]['thumb']: frontier[url]['thumb'] = entry['thumb']
+    return added
+
+def filter_frontier(frontier):
+    return {url: entry for url, entry in frontier.items()
+            if not any(bad in url for bad in EXCLUDE_URL_KEYWORDS) and not any(bad in entry['text'] for bad in EXCLUDE_TITLE_KEYWORDS)}
+
+def fetch_details(driver, site_name, targets, target_selector=None, previous=None):
     final_data = {}
-    for url, thumb in targets.items():
+    reused = 0
+    for done, (url, entry) in enumerate(targets.items()):
+        thumb = entry['thumb']
+        fp = list_fingerprint(url, entry['text'], thumb)
+        # [V72] 지문이 이전 스냅샷과 같으면 저장된 본문 재사용
+        if previous and previous.get(url, {}).get('fp') == fp:
+            final_data[url] = dict(previous[url]); reused += 1
+            continue
         try:
-            driver.get(url); time.sleep(2)
-            try: cont = clean_html(driver.find_element(By.CSS_SELECTOR, target_selector).get_attribute('outerHTML')) if target_selector else clean_html(driver.page_source)
-            except: cont = clean_html(driver.page_source)
-            
-            title = ""
-            title_candidates = ["h1", ".view-tit", ".event-view-title", ".board-view-title", "h2", ".subject", ".tit", ".v_title", ".dt_tit", ".board_view_tit"]
-            for t_sel in title_candidates:
-                try: 
-                    title = driver.find_element(By.CSS_SELECTOR, t_sel).text.strip()
-                    if title: break
-                except: pass
-            if not title: title = driver.title.strip()
+            page = fetch_detail(driver, site_name, url, target_selector)
+            if not page: continue
+            title = page['title']
             
             if any(bad in title for bad in EXCLUDE_TITLE_KEYWORDS): continue
 
-            final_data[url] = {"title": title, "img": thumb, "content": cont[:15000]}
-        except: continue
+            final_data[url] = {"title": title, "img": thumb, "content": page['content'][:15000], "text": page['text'], "hash": page['hash'], "fp": fp}
+        except SiteTimeout as e:
+            count_error("site_budget", e, site_name)
+            mark_partial(site_name, f"상세 {done}/{len(targets)}건 처리 후 {e}")
+            break
+        except Exception as e: count_error("detail_fetch", e, site_name)
+    if reused: print(f"♻️ [{site_name}] 변경 없는 상세 페이지 {reused}건 재사용")
     return final_data
 
-def crawl_site_logic(driver, site_name, base_url, pagination_param=None, target_selector=None):
+def crawl_site_logic(driver, site_name, base_url, pagination_param=None, target_selector=None, previous=None):
     print(f"🚀 [{site_name}] 크롤링 시작...")
     if site_name == "SKT Air":
-        driver.get(base_url); time.sleep(3)
+        with stage_timer("list_page", site_name) as m:
+            navigate(driver, base_url); wait_until_ready(driver, site_name, "list", target_selector)
+            source = driver.page_source
+            m["bytes"] = len(source.encode("utf-8"))
+        browser.log_page(driver, site_name, base_url)
+        replay.record(base_url, source, rendered=True)
         try:
             cont = driver.find_element(By.CSS_SELECTOR, target_selector)
-            return {driver.current_url: {"title": "SKT Air 메인", "img": "", "content": clean_html(cont.get_attribute('outerHTML'))}}
-        except: return {}
+            page = extract_page(cont.get_attribute('outerHTML'))
+            return {normalize_url(replay.original(driver.current_url)): {"title": "SKT Air 메인", "img": "", "content": page['content'], "text": page['text'], "hash": page['hash']}}
+        except Exception as e:
+            count_error("list_container", e, site_name)
+            return {}
     keywords = []
     onclick = None
     base = ""
@@ -251,15 +1289,107 @@ def crawl_site_logic(driver, site_name, base_url, pagination_param=None, target_
     elif site_name == "헬로모바일": keywords, onclick, base = ["event"], r"(\d+)", "https://direct.lghellovision.net"
     elif site_name == "SK 7세븐모바일": keywords, onclick, base = ["event"], r"['\"]([^'\"]+)['\"]", "https://www.sk7mobile.com"
     elif site_name == "SKT 다이렉트": keywords, base = ["event", "plan"], "https://shop.tworld.co.kr"
-    collected = {}
+    frontier, found = {}, 0
     for page in range(1, 4):
         t_url = f"{base_url}{('&' if '?' in base_url else '?')}{pagination_param}={page}" if pagination_param and pagination_param != "#" else base_url
-        driver.get(t_url); time.sleep(2)
-        data = extract_list_with_thumbnails(driver, site_name, keywords, onclick, base, target_selector)
-        if not data: break
-        collected.update(data)
-        if not pagination_param: break
-    return collected
+        try:
+            with stage_timer("list_page", site_name) as m:
+                navigate(driver, t_url); wait_until_ready(driver, site_name, "list")
+                source = driver.page_source
+                m["bytes"] = len(source.encode("utf-8"))
+        except (SiteTimeout, TimeoutException) as e:
+            # 첫 페이지부터 실패하면 기존처럼 어제 데이터로 대체, 이후 페이지면 모은 후보로 계속
+            if page == 1: raise
+            count_error("site_budget", e, site_name)
+            mark_partial(site_name, f"목록 {page}페이지 로드 실패 ({e.__class__.__name__})")
+            break
+        browser.log_page(driver, site_name, t_url)
+        replay.record(t_url, source, rendered=True)
+        links = extract_list_links(driver, site_name, keywords, onclick, base)
+        found += len(links)
+        # 후보가 없거나 모두 이미 본 URL 이면 (페이지 파라미터가 무시된 재렌더링) 더 넘기지 않음
+        if not merge_frontier(frontier, links) or not pagination_param: break
+    end_list_phase()
+    targets = filter_frontier(frontier)
+    print(f"🧭 [{site_name}] 목록 후보 {found}건 → 중복 제거 {len(frontier)}건 → 제외 규칙 적용 {len(targets)}건")
+    return fetch_details(driver, site_name, targets, target_selector, previous)
+
+# =========================================================
+# [V69] 병렬 실행기: 드라이버 풀에 사이트 작업 분배
+# =========================================================
+def start_driver_pool(size, hosts=(), allow_hosts=(), block_dns=False):
+    pool = queue.Queue()
+
+    def factory():
+        with stage_timer("driver_start"): return setup_driver(hosts, allow_hosts, block_dns)
+
+    # uc 는 chromedriver 바이너리를 패치하므로 동시에 띄우면 충돌 → 순차 생성
+    for i in range(size):
+        try:
+            # [V84] 수명 관리 래퍼: 재시작/교체 시에도 같은 factory 로 생성
+            pool.put(browser.ManagedDriver(factory, f"driver{i + 1}", on_restart=lambda reason: count_retry("driver_restart")).ensure())
+        except Exception as e:
+            count_error("driver_start", e)
+            if pool.empty(): raise
+            print(f"⚠️ 드라이버 {i + 1}/{size} 생성 실패, {pool.qsize()}개로 진행: {e}")
+            break
+    return pool
+
+def close_driver_pool(pool):
+    restarts = 0
+    while not pool.empty():
+        try:
+            driver = pool.get_nowait()
+            restarts += driver.restarts
+            driver.quit()
+        except: pass
+    if restarts: print(f"♻️ 실행 중 브라우저 재시작 {restarts}회")
+
+def crawl_all_sites(competitors, yesterday, workers=CRAWL_WORKERS, delta=False):
+    # 드라이버는 모든 사이트가 공유하므로 DNS 차단 예외는 수집 대상 호스트 + 사이트별 허용 호스트 합집합
+    hosts = [urlparse(c['url']).netloc for c in competitors]
+    allow_hosts = sorted({h for c in competitors for h in SITE_LOAD_PROFILE.get(c['name'], {}).get("allow_hosts", [])})
+    # 허용 호스트를 검토하지 않은 사이트가 하나라도 있으면 DNS 차단 없이 URL 패턴 차단(자원 유형/트래커)만 사용
+    unreviewed = [c['name'] for c in competitors if c['name'] not in SITE_LOAD_PROFILE]
+    if unreviewed and browser.LOAD_PROFILE == "light" and browser.BLOCK_THIRD_PARTY:
+        print(f"ℹ️ 제3자 호스트 DNS 차단 생략 (허용 호스트 미검토: {', '.join(unreviewed)})")
+    pool = start_driver_pool(max(1, min(workers, len(competitors))), hosts, allow_hosts, block_dns=not unreviewed)
+    _known_titles.clear()
+    for pages in yesterday.values(): _known_titles.update({u: e.get('title', '') for u, e in normalize_keys(pages).items()})
+
+    def run_job(c):
+        _metrics_ctx.site = c['name']
+        # [V86] 예산은 실제 수집 시작부터 계산
+        start_deadline(c['name'])
+        driver = pool.get()
+        previous = normalize_keys(yesterday.get(c['name'], {})) if delta else None
+        try:
+            # [V84] 사이트 시작 전 상태 확인 (죽었거나 교체 기준을 넘었으면 새 브라우저)
+            driver.ensure().use_site(SITE_LOAD_PROFILE.get(c['name']))
+            return crawl_site_logic(driver, c['name'], c['url'], c['param'], c['selector'], previous), _deadline_ctx.partial
+        finally: pool.put(driver)
+
+    today, status = {}, {}
+    try:
+        with ThreadPoolExecutor(max_workers=pool.qsize()) as executor:
+            jobs = [(c, executor.submit(run_job, c)) for c in competitors]
+            # 결과는 competitors 순서대로 병합 (직렬 실행과 동일한 today 구성)
+            for c, job in jobs:
+                try:
+                    res, partial = job.result()
+                    # [V86] 부분 결과는 수집분을 그대로 저장, 상태 "partial" → 종료 판정 보류 + 다음 실행 기준에는 본 URL 만 반영
+                    if not res: today[c['name']], status[c['name']] = yesterday.get(c['name'], {}), "fallback"
+                    else: today[c['name']], status[c['name']] = res, "partial" if partial else "ok"
+                except Exception as e:
+                    count_error("site_job", e, c['name'])
+                    today[c['name']], status[c['name']] = yesterday.get(c['name'], {}), "fallback"
+    finally:
+        close_driver_pool(pool)
+        save_load_latency()
+        save_fetch_stats()
+        browser.save_stats(LOAD_STATS_FILE)
+        replay.save_archive()
+    return today, status
 
 # =========================================================
 # [대시보드] 차트 포함 인덱스
@@ -305,87 +1435,302 @@ def update_index_page(change_stats):
     with open(os.path.join(DOCS_DIR, "index.html"), "w", encoding="utf-8") as f: f.write(index_html)
 
 # =========================================================
-# [메인] 실행 로직
+# [V79] URL 이동/재게시 매칭: 신규 ↔ 종료 목록에서 본문·제목이 거의 같은 쌍 찾기
 # =========================================================
-def main():
-    try:
-        driver = setup_driver()
-        competitors = [
-            {"name": "SKT 다이렉트", "url": "https://shop.tworld.co.kr/exhibition/submain", "param": None, "selector": "#contents"},
-            {"name": "SKT Air", "url": "https://sktair-event.com/", "param": None, "selector": "#app > div > section.content"},
-            {"name": "U+ 유모바일", "url": "https://www.uplusumobile.com/event-benefit/event/ongoing", "param": None, "selector": ""},
-            {"name": "KTM 모바일", "url": "https://www.ktmmobile.com/event/eventBoardList.do", "param": None, "selector": ""},
-            {"name": "스카이라이프", "url": "https://www.skylife.co.kr/event?category=mobile", "param": "p", "selector": ""},
-            {"name": "헬로모바일", "url": "https://direct.lghellovision.net/event/viewEventList.do?returnTab=allli", "param": "#", "selector": ""},
-            {"name": "SK 7세븐모바일", "url": "https://www.sk7mobile.com/bnef/event/eventIngList.do", "param": None, "selector": ""}
-        ]
-        yesterday = load_previous_data()
-        today = {}
-        change_stats = {c['name']: {'new': 0, 'updated': 0, 'deleted': 0} for c in competitors}
+def entry_body(entry, site_name):
+    text = clean_noise(entry.get('text') if entry.get('text') is not None else get_clean_text(entry.get('content', '')), site_name)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def text_shingles(text):
+    if len(text) <= SHINGLE_SIZE: return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def entry_shingles(entry, site_name, body=None):
+    if body is None: body = entry_body(entry, site_name)
+    return text_shingles(re.sub(r'\s+', ' ', f"{entry.get('title', '')} {body}").strip())
+
+def minhash_signature(shingles):
+    # one-permutation MinHash: 해시 1회로 bin 별 최솟값, 빈 bin 은 회전 densification
+    sig = [None] * MINHASH_BINS
+    for sh in shingles:
+        h = int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "big")
+        b, v = h % MINHASH_BINS, h // MINHASH_BINS
+        if sig[b] is None or v < sig[b]: sig[b] = v
+    if all(v is None for v in sig): return None
+    dense = list(sig)
+    for b in range(MINHASH_BINS):
+        step = 1
+        while dense[b] is None:
+            src = sig[(b + step) % MINHASH_BINS]
+            if src is not None: dense[b] = src + step * (1 << 58)
+            step += 1
+    return dense
+
+def signature_similarity(a, b):
+    return sum(x == y for x, y in zip(a, b)) / MINHASH_BINS
+
+def title_grams(title):
+    title = re.sub(r'\s+', '', title or '')
+    return {title[i:i + 2] for i in range(max(1, len(title) - 1))} if title else set()
+
+def gram_similarity(a, b):
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+def match_moved_events(list_new, list_del, site_name, corpus=()):
+    if not list_new or not list_del: return []
+    items = [("new", i) for i in list_new] + [("del", i) for i in list_del]
+    bodies = [entry_body(item['data'], site_name) for _, item in items]
+    shingle_sets = [entry_shingles(item['data'], site_name, body) for (_, item), body in zip(items, bodies)]
+
+    # 같은 경쟁사 페이지 다수(corpus: 이전+현재 전체)에 반복되는 shingle(메뉴/푸터 등) 제외
+    corpus = list(corpus) or [item['data'] for _, item in items]
+    if len(corpus) > len(items):
+        corpus_bodies = [entry_body(e, site_name) for e in corpus]
+        docs = [entry_shingles(e, site_name, body) for e, body in zip(corpus, corpus_bodies)]
+    else: corpus_bodies, docs = bodies, shingle_sets
+    df, title_df, body_df = {}, {}, {}
+    for sh_set in docs:
+        for sh in sh_set: df[sh] = df.get(sh, 0) + 1
+    for e in corpus:
+        for g in title_grams(e.get('title')): title_df[g] = title_df.get(g, 0) + 1
+    for body in corpus_bodies: body_df[body] = body_df.get(body, 0) + 1
+    limit = max(2, int(len(docs) * BOILERPLATE_DF)) if len(docs) >= 4 else len(docs)
+    signatures = [minhash_signature({sh for sh in sh_set if df.get(sh, 0) <= limit}) for sh_set in shingle_sets]
+    # 본문이 비었거나 공통 레이아웃뿐인 페이지, 여러 URL 이 같은 본문을 내는 페이지(오류 페이지 등)는
+    # 제목/레이아웃만으로 짝이 지어지므로 후보에서 제외 (실제 이동은 이전 1건 + 현재 1건, 별칭 URL 까지 3건)
+    for idx, body in enumerate(bodies):
+        if body_df.get(body, 0) > SHARED_BODY_PAGES or all(df.get(sh, 0) > limit for sh in text_shingles(body)):
+            signatures[idx] = None
+    # 제목도 사이트 공통 접미사("< 진행이벤트 < ..." 등)를 빼고 비교
+    titles = [{g for g in title_grams(item['data'].get('title')) if title_df.get(g, 0) <= limit} for _, item in items]
+
+    # LSH: 밴드 값이 같은 버킷에 신규/종료가 함께 있으면 후보
+    rows, buckets = MINHASH_BINS // LSH_BANDS, {}
+    for idx, sig in enumerate(signatures):
+        if sig is None: continue
+        for band in range(LSH_BANDS):
+            buckets.setdefault((band, tuple(sig[band * rows:(band + 1) * rows])), []).append(idx)
+    candidates = set()
+    for members in buckets.values():
+        news = [m for m in members if items[m][0] == "new"]
+        dels = [m for m in members if items[m][0] == "del"]
+        candidates.update((n, d) for n in news for d in dels)
+
+    scored = sorted(((signature_similarity(signatures[n], signatures[d]), n, d) for n, d in candidates), key=lambda x: (-x[0], x[1], x[2]))
+    pairs, used = [], set()
+    for score, n, d in scored:
+        if score < SIMILARITY_THRESHOLD: break
+        if n in used or d in used: continue
+        if gram_similarity(titles[n], titles[d]) < TITLE_SIMILARITY: continue
+        used.update((n, d))
+        pairs.append((items[n][1], items[d][1], score))
+    return pairs
+
+# =========================================================
+# [V80] 비교 단계: 작업 단위 분할 → 프로세스 풀 → 원래 순서로 병합
+# =========================================================
+def compare_batch(name, triples):
+    return [(url, check_update_same_url(old, new, name)) for url, old, new in triples]
+
+def match_site(name, list_new, list_del, corpus):
+    moved = []
+    for new_item, del_item, score in match_moved_events(list_new, list_del, name, corpus):
+        diff = check_update_same_url(del_item['data'], new_item['data'], name) or {"msg": "", "html": ""}
+        moved.append((new_item['url'], del_item['url'], score, diff))
+    return moved
+
+def run_compare_jobs(jobs, parallel):
+    # 노이즈 디버그 집계는 프로세스 간에 합쳐지지 않으므로 직렬 실행
+    if parallel and len(jobs) > 1 and COMPARE_WORKERS > 1 and not NOISE_DEBUG:
+        try:
+            with ProcessPoolExecutor(max_workers=min(COMPARE_WORKERS, len(jobs))) as executor:
+                futures = [executor.submit(metered_job, fn, *args) for _, fn, args in jobs]
+                done = [f.result() for f in futures]
+            for _, delta in done: merge_metrics(delta)
+            return [res for res, _ in done]
+        except (BrokenProcessPool, PicklingError, OSError) as e:
+            count_retry("compare_serial_fallback")
+            print(f"⚠️ 병렬 비교 실패, 직렬로 재실행: {e}")
+    return [fn(*args) for _, fn, args in jobs]
+
+def compare_all(today, yesterday, parallel=None, partial=()):
+    if parallel is None: parallel = COMPARE_PARALLEL
+    plans, jobs = {}, []
+    for name, pages in today.items():
+        # [V85] 정규화 전에 저장된 스냅샷(--rediff 등)도 같은 URL 키로 비교
+        pages, old = normalize_keys(pages), normalize_keys(yesterday.get(name, {}))
+        new_urls = [u for u in pages if u not in old]
+        # [V86] 부분 수집 사이트는 못 본 URL 을 종료로 판정하지 않음
+        del_urls = [u for u in old if u not in pages] if name not in partial else []
+        common = [u for u in pages if u in old]
+        plans[name] = (pages, old, new_urls, del_urls)
+        for i in range(0, len(common), COMPARE_BATCH):
+            jobs.append((name, compare_batch, (name, [(u, old[u], pages[u]) for u in common[i:i + COMPARE_BATCH]])))
+        if new_urls and del_urls:
+            corpus = list(pages.values()) + [old[u] for u in del_urls]
+            jobs.append((name, match_site, (name, [{"url": u, "data": pages[u]} for u in new_urls], [{"url": u, "data": old[u]} for u in del_urls], corpus)))
+    results = run_compare_jobs(jobs, parallel)
+
+    # 작업 제출 순서대로 병합 → 직렬/병렬 결과가 항상 같은 순서
+    comparisons = {}
+    for name, (pages, old, new_urls, del_urls) in plans.items():
+        list_upd, moved = [], []
+        for (job_name, fn, _), res in zip(jobs, results):
+            if job_name != name: continue
+            if fn is compare_batch: list_upd += [{"url": u, "reason": d['msg'], "data": pages[u], "diff_html": d['html']} for u, d in res if d]
+            else: moved = res
+
+        # [V79] 새 URL 로 재게시된 이벤트는 신규+종료 대신 변경 1건으로 처리
+        for new_url, del_url, score, diff in moved:
+            moved_html = f"<div style='margin-bottom:8px;'><b>URL:</b> {del_url} <span style='color:blue;'>▶</span> <b>{new_url}</b> (유사도 {score:.0%})</div>"
+            list_upd.append({"url": new_url, "reason": ", ".join(filter(None, ["URL 이동", diff['msg']])), "data": pages[new_url], "diff_html": moved_html + diff['html']})
+        moved_new, moved_del = {m[0] for m in moved}, {m[1] for m in moved}
+        list_new = [{"url": u, "data": pages[u]} for u in new_urls if u not in moved_new]
+        list_del = [{"url": u, "data": old[u]} for u in del_urls if u not in moved_del]
+        comparisons[name] = (list_new, list_upd, list_del)
+    return comparisons
+
+# =========================================================
+# [리포트] 비교 결과 → 변경 리포트 / 전체 목록 / 대시보드
+# =========================================================
+def build_reports(today, yesterday, timestamp, change_stats=None, parallel=None, partial=()):
+    display_date = f"{timestamp[:4]}-{timestamp[4:6]}-{timestamp[6:8]}"
+    change_stats = change_stats or {name: {'new': 0, 'updated': 0, 'deleted': 0} for name in today}
+    report_body, total_chg, summary = "", 0, []
+    comparisons = compare_all(today, yesterday, parallel, partial)
+    for name, pages in today.items():
+        list_new, list_upd, list_del = comparisons[name]
         
-        for c in competitors:
-            try:
-                res = crawl_site_logic(driver, c['name'], c['url'], c['param'], c['selector'])
-                today[c['name']] = res if res else yesterday.get(c['name'], {})
-            except: today[c['name']] = yesterday.get(c['name'], {})
-        driver.quit()
-        with open(os.path.join(DATA_DIR, f"data_{FILE_TIMESTAMP}.json"), "w", encoding="utf-8") as f: json.dump(today, f, ensure_ascii=False)
+        change_stats.setdefault(name, {}).update({'new': len(list_new), 'updated': len(list_upd), 'deleted': len(list_del)})
+        cnt = len(list_new) + len(list_upd) + len(list_del)
         
-        report_body, total_chg, summary = "", 0, []
-        for name, pages in today.items():
-            old = yesterday.get(name, {})
-            list_new, list_del, list_upd = [{"url": u, "data": pages[u]} for u in (set(pages.keys()) - set(old.keys()))], [{"url": u, "data": old[u]} for u in (set(old.keys()) - set(pages.keys()))], []
-            for url in (set(pages.keys()) & set(old.keys())):
-                diff = check_update_same_url(old[url], pages[url])
-                if diff: list_upd.append({"url": url, "reason": diff['msg'], "data": pages[url], "diff_html": diff['html']})
+        if cnt > 0:
+            s_html = f"<h2>🏢 {name} ({cnt}건)</h2>"
+            for i in list_new: s_html += f"<div style='background:#f9fff9; padding:10px; border:1px solid #cfc; margin-bottom:10px;'><img src='{i['data']['img']}' style='height:60px; margin-right:10px;'><b>[신규] {i['data']['title']}</b><br><a href='{i['url']}'>이동</a></div>"
             
-            change_stats[name].update({'new': len(list_new), 'updated': len(list_upd), 'deleted': len(list_del)})
-            cnt = len(list_new) + len(list_upd) + len(list_del)
+            # [V68] 변경 사유(reason) 표시 복구
+            for i in list_upd: 
+                s_html += f"""
+                <div style='background:#fffcf5; padding:10px; border:1px solid #fc9; margin-bottom:10px;'>
+                    <b>[변경] {i['data']['title']}</b><br>
+                    <span style='color:#e67e22; font-size:12px; font-weight:bold;'>💡 {i['reason']}</span><br>
+                    {i['diff_html']}<br>
+                    <a href='{i['url']}'>이동</a>
+                </div>
+                """
             
-            if cnt > 0:
-                s_html = f"<h2>🏢 {name} ({cnt}건)</h2>"
-                for i in list_new: s_html += f"<div style='background:#f9fff9; padding:10px; border:1px solid #cfc; margin-bottom:10px;'><img src='{i['data']['img']}' style='height:60px; margin-right:10px;'><b>[신규] {i['data']['title']}</b><br><a href='{i['url']}'>이동</a></div>"
-                
-                # [V68] 변경 사유(reason) 표시 복구
-                for i in list_upd: 
-                    s_html += f"""
-                    <div style='background:#fffcf5; padding:10px; border:1px solid #fc9; margin-bottom:10px;'>
-                        <b>[변경] {i['data']['title']}</b><br>
-                        <span style='color:#e67e22; font-size:12px; font-weight:bold;'>💡 {i['reason']}</span><br>
-                        {i['diff_html']}<br>
-                        <a href='{i['url']}'>이동</a>
-                    </div>
-                    """
-                
-                for i in list_del: s_html += f"<div style='background:#fff5f5; padding:10px; border:1px solid #fcc; margin-bottom:10px; color:#999;'><strike>{i['data']['title']}</strike> (종료)</div>"
-                report_body += s_html + "<hr>"; total_chg += cnt; summary.append(f"{name}({cnt})")
-        
-        rep_file = f"report_{FILE_TIMESTAMP}.html"
-        with open(os.path.join(REPORT_DIR, rep_file), "w", encoding="utf-8") as f: f.write(f"<html><head><meta charset='utf-8'></head><body><h1>📅 {DISPLAY_DATE} 리포트</h1>{report_body}</body></html>")
-        
-        list_html = f"<h1>📂 {DISPLAY_DATE} 목록</h1><hr>"
-        for name, pages in today.items():
-            list_html += f"<h3>{name} ({len(pages)}개)</h3><div style='display:grid; grid-template-columns:1fr 1fr; gap:10px;'>"
-            for u, d in pages.items(): list_html += f"<div style='border:1px solid #eee; padding:5px;'><a href='{u}'><img src='{d['img']}' style='height:50px;'> {d['title']}</a></div>"
-            list_html += "</div>"
-        list_file = f"list_{FILE_TIMESTAMP}.html"
+            for i in list_del: s_html += f"<div style='background:#fff5f5; padding:10px; border:1px solid #fcc; margin-bottom:10px; color:#999;'><strike>{i['data']['title']}</strike> (종료)</div>"
+            if name in partial: s_html += "<p style='color:#999;'>⏱️ 시간 예산 초과로 일부만 수집 (종료 판정 보류)</p>"
+            report_body += s_html + "<hr>"; total_chg += cnt; summary.append(f"{name}({cnt})")
+    
+    rep_file = f"report_{timestamp}.html"
+    with stage_timer("report_write") as m:
+        report_html = f"<html><head><meta charset='utf-8'></head><body><h1>📅 {display_date} 리포트</h1>{report_body}</body></html>"
+        with open(os.path.join(REPORT_DIR, rep_file), "w", encoding="utf-8") as f: f.write(report_html)
+        m["bytes"] = len(report_html.encode("utf-8"))
+    
+    list_html = f"<h1>📂 {display_date} 목록</h1><hr>"
+    for name, pages in today.items():
+        list_html += f"<h3>{name} ({len(pages)}개)</h3><div style='display:grid; grid-template-columns:1fr 1fr; gap:10px;'>"
+        for u, d in pages.items(): list_html += f"<div style='border:1px solid #eee; padding:5px;'><a href='{u}'><img src='{d['img']}' style='height:50px;'> {d['title']}</a></div>"
+        list_html += "</div>"
+    list_file = f"list_{timestamp}.html"
+    with stage_timer("report_write") as m:
         with open(os.path.join(REPORT_DIR, list_file), "w", encoding="utf-8") as f: f.write(list_html)
+        m["bytes"] = len(list_html.encode("utf-8"))
 
-        update_index_page(change_stats)
-        
-        db_url = f"https://{GITHUB_USER}.github.io/{REPO_NAME}/"
-        rp_url = f"https://{GITHUB_USER}.github.io/{REPO_NAME}/reports/{rep_file}"
-        ls_url = f"https://{GITHUB_USER}.github.io/{REPO_NAME}/reports/{list_file}"
-        txt = f"총 {total_chg}건 변동 ({', '.join(summary)})" if total_chg > 0 else "특이사항 없음"
+    with stage_timer("index_page"): update_index_page(change_stats)
+    if NOISE_DEBUG: noise_debug_report()
+    return {"report": rep_file, "list": list_file, "total": total_chg, "summary": summary, "partial": [n for n in today if n in partial]}
+
+def notify_slack(result, display_time, metrics=None):
+    db_url = f"https://{GITHUB_USER}.github.io/{REPO_NAME}/"
+    rp_url = f"https://{GITHUB_USER}.github.io/{REPO_NAME}/reports/{result['report']}"
+    ls_url = f"https://{GITHUB_USER}.github.io/{REPO_NAME}/reports/{result['list']}"
+    txt = f"총 {result['total']}건 변동 ({', '.join(result['summary'])})" if result['total'] > 0 else "특이사항 없음"
+    
+    payload = {
+        "text": f"📢 *[KST {display_time}] 경쟁사 동향 보고* \n\n✅ *요약:* {txt}\n\n👉 *변경 리포트:* {rp_url}\n🗂️ *전체 목록:* {ls_url}\n📂 *대시보드:* {db_url}"
+    }
+    if result.get("partial"): payload["text"] += f"\n⏱️ *부분 수집 (종료 판정 보류):* {', '.join(result['partial'])}"
+    if metrics: payload["text"] += "\n\n" + metrics_slack_text(metrics)
+    send_slack_alert(SLACK_WEBHOOK_URL, payload)
+
+# =========================================================
+# [V78] 재비교 모드: 저장된 스냅샷 두 개로 비교/리포트/목록/대시보드만 재생성 (브라우저 불필요)
+# =========================================================
+def resolve_snapshot(ref, runs):
+    # 타임스탬프(YYYYmmdd_HHMMSS) 또는 파일 경로 → (타임스탬프, 데이터)
+    if os.path.exists(ref): return snapshot_timestamp(ref), load_snapshot(ref)
+    for run in runs:
+        if run["ts"] == ref: return ref, {name: load_site_snapshot(run, name) for name in run["sites"]}
+    raise ValueError(f"스냅샷을 찾을 수 없음: {ref}")
+
+def rediff(old_ref, new_ref, notify=False):
+    runs = load_snapshot_index()["runs"]
+    _, yesterday = resolve_snapshot(old_ref, runs)
+    timestamp, today = resolve_snapshot(new_ref, runs)
+    run = next((r for r in runs if r["ts"] == timestamp), {"sites": {}})
+    result = build_reports(today, yesterday, timestamp, partial=[n for n, st in run["sites"].items() if st.get("partial")])
+    print(f"♻️ {old_ref} → {new_ref}: 총 {result['total']}건 ({', '.join(result['summary']) or '변동 없음'}) → {result['report']}")
+    if notify: notify_slack(result, f"{timestamp[9:11]}:{timestamp[11:13]}:{timestamp[13:15]}")
+    return result
+
+def rediff_all():
+    runs = load_snapshot_index()["runs"]
+    for prev, curr in zip(runs, runs[1:]): rediff(prev["ts"], curr["ts"])
+
+# =========================================================
+# [메인] 실행 로직
+# =========================================================
+COMPETITORS = [
+    {"name": "SKT 다이렉트", "url": "https://shop.tworld.co.kr/exhibition/submain", "param": None, "selector": "#contents"},
+    {"name": "SKT Air", "url": "https://sktair-event.com/", "param": None, "selector": "#app > div > section.content"},
+    {"name": "U+ 유모바일", "url": "https://www.uplusumobile.com/event-benefit/event/ongoing", "param": None, "selector": ""},
+    {"name": "KTM 모바일", "url": "https://www.ktmmobile.com/event/eventBoardList.do", "param": None, "selector": ""},
+    {"name": "스카이라이프", "url": "https://www.skylife.co.kr/event?category=mobile", "param": "p", "selector": ""},
+    {"name": "헬로모바일", "url": "https://direct.lghellovision.net/event/viewEventList.do?returnTab=allli", "param": "#", "selector": ""},
+    {"name": "SK 7세븐모바일", "url": "https://www.sk7mobile.com/bnef/event/eventIngList.do", "param": None, "selector": ""}
+]
+
+def main():
+    try:
+        competitors = COMPETITORS
+        yesterday = load_baseline(parse_baseline_at(BASELINE_AT))
+        change_stats = {c['name']: {'new': 0, 'updated': 0, 'deleted': 0} for c in competitors}
+        crawl_state = load_crawl_state()
+        delta = use_delta_crawl(crawl_state)
+        print(f"🧭 수집 모드: {'델타 (변경된 목록 항목만 상세 방문)' if delta else '전체 재검증'}")
+        today, site_status = crawl_all_sites(competitors, yesterday, delta=delta)
+        save_crawl_state(crawl_state, delta)
+        hash_thumbnails(today)
+        save_snapshot(today, FILE_TIMESTAMP, site_status)
         
-        payload = {
-            "text": f"📢 *[KST {DISPLAY_TIME}] 경쟁사 동향 보고* \n\n✅ *요약:* {txt}\n\n👉 *변경 리포트:* {rp_url}\n🗂️ *전체 목록:* {ls_url}\n📂 *대시보드:* {db_url}"
-        }
-        send_slack_alert(SLACK_WEBHOOK_URL, payload)
+        partial = [name for name, st in site_status.items() if st == "partial"]
+        result = build_reports(today, yesterday, FILE_TIMESTAMP, change_stats, partial=partial)
+        if replay.REPLAY_MODE == "replay": print("📼 재생 모드: 슬랙 전송 생략")
+        else: notify_slack(result, DISPLAY_TIME, metrics_snapshot(FILE_TIMESTAMP) if METRICS_SLACK else None)
         print("✅ 완료")
 
     except Exception as e:
         print(f"🔥 Error: {traceback.format_exc()}")
         send_slack_alert(SLACK_WEBHOOK_URL, {"text": f"🚨 에러: {str(e)}"})
+    finally:
+        metrics = save_metrics(FILE_TIMESTAMP)
+        print(f"📈 실행 {metrics['total_sec']:.0f}s, 예외 {sum(v['count'] for sites in metrics['errors'].values() for v in sites.values())}건 → {METRICS_DIR}/metrics_{FILE_TIMESTAMP}.json")
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="경쟁사 프로모션 모니터링")
+    parser.add_argument("--rediff", nargs=2, metavar=("OLD", "NEW"), help="저장된 두 스냅샷(타임스탬프 또는 경로)으로 리포트만 재생성")
+    parser.add_argument("--rediff-all", action="store_true", help="인덱스의 연속된 모든 실행 쌍에 대해 리포트 재생성")
+    parser.add_argument("--notify", action="store_true", help="--rediff 결과도 슬랙으로 전송")
+    parser.add_argument("--serial", action="store_true", help="비교 단계를 프로세스 풀 없이 직렬 실행")
+    args = parser.parse_args(argv)
+    if args.serial:
+        global COMPARE_PARALLEL
+        COMPARE_PARALLEL = False
+    if args.rediff: rediff(*args.rediff, notify=args.notify)
+    elif args.rediff_all: rediff_all()
+    else: main()
 
-if __name__ == "__main__": main()
+if __name__ == "__main__": cli()
@@ -0,0 +1,171 @@
+"""
+[도구] 크롤링 응답 녹화/재생 (오프라인 재현 · 프로파일링 · 회귀 테스트용)
+  REPLAY_MODE=record : 크롤러가 받은 목록/상세 응답을 REPLAY_DIR 에 보관
+  REPLAY_MODE=replay : 보관본을 로컬 HTTP 서버로 제공, 크롤러는 route() 로 바꾼 주소에 접속
+단독 실행: python replay.py --port 8765 --latency 0.3 --fail-rate 0.05  (REPLAY_SERVER 로 지정해 사용)
+"""
+
+import os
+import re
+import json
+import gzip
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote, urlsplit
+
+# =========================================================
+# [설정] 환경 변수
+# =========================================================
+REPLAY_MODE = os.environ.get("REPLAY_MODE", "").lower()      # "" | record | replay
+REPLAY_DIR = os.environ.get("REPLAY_DIR", os.path.join("data", "replay"))
+REPLAY_SERVER = os.environ.get("REPLAY_SERVER", "")           # 비우면 replay 모드에서 내장 서버 자동 기동
+REPLAY_LATENCY = float(os.environ.get("REPLAY_LATENCY", "0"))    # 응답마다 추가 지연 (초)
+REPLAY_JITTER = float(os.environ.get("REPLAY_JITTER", "0"))      # 지연에 더할 0~N 초 랜덤값
+REPLAY_FAIL_RATE = float(os.environ.get("REPLAY_FAIL_RATE", "0"))  # 실패 주입 확률 (0~1)
+REPLAY_FAIL_STATUS = int(os.environ.get("REPLAY_FAIL_STATUS", "503"))  # 0 이면 상태 코드 대신 연결 끊기
+REPLAY_SEED = os.environ.get("REPLAY_SEED", "")               # 지연/실패 주입 재현용 시드
+
+ARCHIVE_FILE = "archive.json"
+BODY_DIR = "bodies"
+SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.I | re.S)
+
+_lock = threading.RLock()
+_archive = None
+_server_url = None
+
+# =========================================================
+# [보관본] archive.json = {"recorded_at", "urls": {url: {status, type, body, rendered}}}
+# =========================================================
+def archive_key(url):
+    # 프래그먼트는 서버로 전달되지 않고, 브라우저는 비ASCII 를 퍼센트 인코딩하므로 디코딩된 형태로 비교
+    return unquote(url.split("#", 1)[0])
+
+def load_archive(directory=None):
+    global _archive
+    with _lock:
+        if _archive is None:
+            path = os.path.join(directory or REPLAY_DIR, ARCHIVE_FILE)
+            try:
+                with open(path, "r", encoding="utf-8") as f: _archive = json.load(f)
+            except: _archive = {"recorded_at": "", "urls": {}}
+        return _archive
+
+def recorded_at():
+    # 녹화 시각 (replay 시 날짜 기준값으로 사용), 녹화본이 없으면 None
+    value = load_archive().get("recorded_at")
+    return datetime.fromisoformat(value) if value else None
+
+def body_path(body_id, directory=None):
+    return os.path.join(directory or REPLAY_DIR, BODY_DIR, f"{body_id}.html.gz")
+
+def record(url, body, status=200, content_type="text/html", rendered=False):
+    # rendered=True: 브라우저가 그린 DOM (재생 시 스크립트 제거 후 정적 페이지로 제공), bytes 는 이미지 등 원본 그대로
+    if REPLAY_MODE != "record" or body is None: return
+    raw = body if isinstance(body, bytes) else body.encode("utf-8")
+    body_id = hashlib.sha1(raw).hexdigest()
+    path = body_path(body_id)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.GzipFile(path, "wb", mtime=0) as f: f.write(raw)
+    archive = load_archive()
+    with _lock:
+        if not archive.get("recorded_at"): archive["recorded_at"] = datetime.now(timezone.utc).isoformat()
+        archive["urls"][archive_key(url)] = {"status": status, "type": content_type, "body": body_id, "rendered": rendered}
+
+def save_archive():
+    if REPLAY_MODE != "record" or _archive is None: return
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    with _lock:
+        with open(os.path.join(REPLAY_DIR, ARCHIVE_FILE), "w", encoding="utf-8") as f: json.dump(_archive, f, ensure_ascii=False, indent=1)
+    print(f"📼 응답 {len(_archive['urls'])}건 녹화 → {REPLAY_DIR}")
+
+# =========================================================
+# [재생] 로컬 HTTP 서버: /<scheme>/<host>/<path>?<query> → 보관된 응답
+# =========================================================
+def make_handler(directory, latency, jitter, fail_rate, fail_status, rng):
+    archive = load_archive(directory)
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args): pass
+
+        def do_GET(self):
+            delay = latency + (rng.uniform(0, jitter) if jitter else 0)
+            if delay: time.sleep(delay)
+            if fail_rate and rng.random() < fail_rate:
+                if not fail_status:
+                    self.close_connection = True
+                    return
+                return self.respond(fail_status, b"injected failure", "text/plain")
+
+            scheme, _, rest = self.path.lstrip("/").partition("/")
+            entry = archive["urls"].get(archive_key(f"{scheme}://{rest}"))
+            if not entry: return self.respond(404, b"not recorded", "text/plain")
+            # 본문 해시를 ETag 로 제공 (조건부 요청 → 304 재현)
+            etag = f'"{entry["body"]}"'
+            if self.headers.get("If-None-Match") == etag: return self.respond(304, b"", entry.get("type") or "text/html", etag)
+            with gzip.open(body_path(entry["body"], directory), "rb") as f: raw = f.read()
+            if entry.get("rendered"): raw = SCRIPT_RE.sub("", raw.decode("utf-8")).encode("utf-8")
+            self.respond(entry["status"], raw, entry.get("type") or "text/html", etag)
+
+        def respond(self, status, raw, content_type, etag=None):
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8" if content_type.startswith("text/") else content_type)
+            if etag: self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+    return ReplayHandler
+
+def start_server(directory=None, port=0, latency=REPLAY_LATENCY, jitter=REPLAY_JITTER, fail_rate=REPLAY_FAIL_RATE, fail_status=REPLAY_FAIL_STATUS, seed=REPLAY_SEED):
+    rng = random.Random(seed) if seed != "" else random.Random()
+    handler = make_handler(directory or REPLAY_DIR, latency, jitter, fail_rate, fail_status, rng)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def server_url():
+    global _server_url
+    with _lock:
+        if _server_url is None:
+            if REPLAY_SERVER: _server_url = REPLAY_SERVER.rstrip("/")
+            else:
+                _, _server_url = start_server()
+                print(f"📼 재생 서버 기동: {_server_url} ({REPLAY_DIR})")
+        return _server_url
+
+def route(url):
+    # replay 모드에서만 실제 주소를 재생 서버 주소로 변환
+    if REPLAY_MODE != "replay": return url
+    parts = urlsplit(url)
+    return f"{server_url()}/{parts.scheme}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+def original(url):
+    # route() 의 역변환 (driver.current_url 등을 실제 주소로 되돌림)
+    if REPLAY_MODE != "replay" or not url.startswith(server_url()): return url
+    scheme, _, rest = url[len(server_url()):].lstrip("/").partition("/")
+    return f"{scheme}://{rest}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화된 크롤링 응답을 로컬 HTTP 서버로 재생")
+    parser.add_argument("--dir", default=REPLAY_DIR, help="녹화본 디렉터리")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=REPLAY_LATENCY, help="응답마다 추가 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=REPLAY_JITTER, help="지연에 더할 0~N 초 랜덤값")
+    parser.add_argument("--fail-rate", type=float, default=REPLAY_FAIL_RATE, help="실패 주입 확률 (0~1)")
+    parser.add_argument("--fail-status", type=int, default=REPLAY_FAIL_STATUS, help="실패 시 상태 코드 (0 = 연결 끊기)")
+    parser.add_argument("--seed", default=REPLAY_SEED, help="지연/실패 주입 시드")
+    args = parser.parse_args()
+    server, url = start_server(args.dir, args.port, args.latency, args.jitter, args.fail_rate, args.fail_status, args.seed)
+    print(f"📼 {len(load_archive(args.dir)['urls'])}건 재생 중: {url}  (크롤러에 REPLAY_MODE=replay REPLAY_SERVER={url})")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt: server.shutdown()
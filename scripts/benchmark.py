@@ -0,0 +1,152 @@
+"""
+[도구] 스냅샷 코퍼스 벤치마크: 연속된 스냅샷 쌍을 비교/리포트 파이프라인 단계별로 재생
+사용법: python scripts/benchmark.py [--pairs N] [--no-memory] [--save-baseline] [--tolerance 0.25]
+  --pairs N        : 최근 N 쌍만 사용 (기본: 전체)
+  --no-memory      : tracemalloc 측정 생략 (시간만 측정)
+  --save-baseline  : 이번 결과를 기준값(BASELINE_FILE)으로 저장
+  --tolerance      : 기준 대비 허용 증가율, 초과 시 회귀로 표시하고 종료 코드 1
+시간과 메모리는 따로 측정 (tracemalloc 이 켜져 있으면 실행 시간이 부풀려지므로)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+
+BASELINE_FILE = os.path.join(main.DATA_DIR, "benchmark_baseline.json")
+STAGES = ["load", "clean_html", "get_clean_text", "clean_noise", "check_update", "diff_view", "report", "index_page"]
+MIN_DELTA_SEC = 0.05   # 이보다 작은 시간 증가는 측정 오차로 보고 무시
+MIN_DELTA_KB = 256     # 메모리도 동일
+
+
+class Recorder:
+    # 단계/경쟁사별 누적 시간(sec)과 최대 peak(kb, 단계 시작 시점 대비 추가 할당량)
+    def __init__(self, memory):
+        self.memory, self.results = memory, {}
+
+    def measure(self, stage, site, fn, *args):
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        value = fn(*args)
+        sec = time.perf_counter() - start
+        slot = self.results.setdefault(stage, {}).setdefault(site, {"sec": 0.0, "peak_kb": 0})
+        slot["sec"] += sec
+        if self.memory: slot["peak_kb"] = max(slot["peak_kb"], (tracemalloc.get_traced_memory()[1] - base) // 1024)
+        return value
+
+
+def run_pair(rec, old_path, new_path, timestamp):
+    yesterday = rec.measure("load", "*", main.load_snapshot, old_path)
+    today = rec.measure("load", "*", main.load_snapshot, new_path)
+
+    for name, pages in today.items():
+        old = yesterday.get(name, {})
+        for page in pages.values():
+            rec.measure("clean_html", name, main.clean_html, page.get("content", ""))
+            rec.measure("get_clean_text", name, main.get_clean_text, page.get("content", ""))
+        for url in [u for u in pages if u in old]:
+            p_text, c_text = main.body_texts(old[url], pages[url])
+            p_clean = rec.measure("clean_noise", name, main.clean_noise, p_text, name)
+            c_clean = rec.measure("clean_noise", name, main.clean_noise, c_text, name)
+            rec.measure("check_update", name, main.check_update_same_url, old[url], pages[url], name)
+            if p_clean != c_clean: rec.measure("diff_view", name, main.generate_diff_view, p_clean, c_clean)
+
+    # 리포트 단계는 대시보드 갱신을 빼고 측정, 대시보드는 index_page 단계로 따로 측정
+    update_index_page, main.update_index_page = main.update_index_page, lambda change_stats: None
+    try: rec.measure("report", "*", main.build_reports, today, yesterday, timestamp, None, False)
+    finally: main.update_index_page = update_index_page
+    change_stats = {name: {"new": 0, "updated": 0, "deleted": 0} for name in today}
+    rec.measure("index_page", "*", main.update_index_page, change_stats)
+
+
+def run(pairs, memory):
+    runs = main.list_snapshots()
+    pair_list = list(zip(runs, runs[1:]))[-pairs:] if pairs else list(zip(runs, runs[1:]))
+    # 리포트/대시보드는 임시 디렉터리에 생성 (docs/ 를 건드리지 않음)
+    out_dir = tempfile.mkdtemp(prefix="bench_")
+    main.DOCS_DIR, main.REPORT_DIR = out_dir, os.path.join(out_dir, "reports")
+    os.makedirs(main.REPORT_DIR, exist_ok=True)
+
+    rec = Recorder(memory)
+    if memory: tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        for (_, old_path), (ts, new_path) in pair_list: run_pair(rec, old_path, new_path, ts)
+    finally:
+        if memory: tracemalloc.stop()
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return {
+        "pairs": [f"{a[0]}..{b[0]}" for a, b in pair_list],
+        "python": platform.python_version(),
+        "total_sec": round(time.perf_counter() - start, 3),
+        "stages": {stage: {site: {"sec": round(v["sec"], 4), "peak_kb": v["peak_kb"]} for site, v in rec.results.get(stage, {}).items()} for stage in STAGES},
+    }
+
+
+def compare(result, baseline, tolerance):
+    regressions = []
+    for stage, sites in result["stages"].items():
+        for site, cur in sites.items():
+            base = baseline.get("stages", {}).get(stage, {}).get(site)
+            if not base: continue
+            if cur["sec"] > base["sec"] * (1 + tolerance) and cur["sec"] - base["sec"] > MIN_DELTA_SEC:
+                regressions.append(f"{stage}/{site}: 시간 {base['sec']:.3f}s → {cur['sec']:.3f}s")
+            if base["peak_kb"] and cur["peak_kb"] > base["peak_kb"] * (1 + tolerance) and cur["peak_kb"] - base["peak_kb"] > MIN_DELTA_KB:
+                regressions.append(f"{stage}/{site}: 메모리 {base['peak_kb']:,}KB → {cur['peak_kb']:,}KB")
+    return regressions
+
+
+def print_table(result, baseline):
+    base_stages = baseline.get("stages", {}) if baseline else {}
+    print(f"{'단계':<16}{'경쟁사':<16}{'시간(s)':>10}{'기준(s)':>10}{'peak(KB)':>12}{'기준(KB)':>12}")
+    for stage, sites in result["stages"].items():
+        for site, cur in sorted(sites.items(), key=lambda kv: -kv[1]["sec"]):
+            base = base_stages.get(stage, {}).get(site, {})
+            base_sec = f"{base['sec']:>10.3f}" if base else f"{'-':>10}"
+            base_kb = f"{base['peak_kb']:>12,}" if base else f"{'-':>12}"
+            print(f"{stage:<16}{site:<16}{cur['sec']:>10.3f}{base_sec}{cur['peak_kb']:>12,}{base_kb}")
+    print(f"⏱️ 전체 {result['total_sec']:.1f}s ({len(result['pairs'])}쌍)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스냅샷 쌍으로 비교/리포트 파이프라인 벤치마크")
+    parser.add_argument("--pairs", type=int, default=0, help="최근 N 쌍만 사용 (0 = 전체)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 증가율 (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # 시간 측정 (tracemalloc 꺼짐) → 메모리 측정 (tracemalloc 켜짐) 후 병합
+    result = run(args.pairs, memory=False)
+    if not args.no_memory:
+        mem = run(args.pairs, memory=True)
+        for stage, sites in result["stages"].items():
+            for site, v in sites.items(): v["peak_kb"] = mem["stages"][stage][site]["peak_kb"]
+
+    baseline = None
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f: baseline = json.load(f)
+    print_table(result, baseline)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f: json.dump(result, f, ensure_ascii=False, indent=1)
+        print(f"💾 기준값 저장: {BASELINE_FILE}")
+    elif baseline:
+        if baseline.get("pairs") != result["pairs"]: print("⚠️ 기준값과 스냅샷 쌍 구성이 달라 비교가 부정확할 수 있습니다.")
+        regressions = compare(result, baseline, args.tolerance)
+        for r in regressions: print(f"❌ 회귀: {r}")
+        if regressions: sys.exit(1)
+        print("✅ 기준 대비 회귀 없음")
@@ -0,0 +1,66 @@
+"""
+[도구] 구버전 스냅샷(data/data_*.json) → manifest + 본문 blob 저장소 변환
+사용법: python scripts/migrate_snapshots.py [--delete] [--dry-run]
+  --delete  : 변환 결과를 다시 읽어 원본과 같을 때만 data_*.json 삭제
+  --dry-run : 파일을 쓰지 않고 변환 대상과 원본 용량만 출력
+"""
+
+import os
+import sys
+import glob
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+
+
+def dir_size(path):
+    total = 0
+    for base, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(base, f)) for f in files)
+    return total
+
+
+def migrate(delete=False, dry_run=False):
+    legacy = sorted(glob.glob(os.path.join(main.DATA_DIR, "data_*.json")))
+    if not legacy:
+        print("변환할 구버전 스냅샷이 없습니다.")
+        return
+
+    before = sum(os.path.getsize(p) for p in legacy)
+    print(f"📦 대상 {len(legacy)}개 ({before / 1024 / 1024:.1f} MB)")
+    if dry_run: return
+
+    blobs_before = dir_size(main.BLOB_DIR)
+    converted = 0
+    for path in legacy:
+        ts = main.snapshot_timestamp(path)
+        try:
+            data = main.load_snapshot(path)
+            manifest = main.save_snapshot(data, ts)
+            if main.load_snapshot(manifest) != data:
+                print(f"❌ {os.path.basename(path)}: 변환 결과 불일치, 원본 유지")
+                continue
+        except Exception as e:
+            print(f"❌ {os.path.basename(path)}: {e}")
+            continue
+        converted += 1
+        if delete: os.remove(path)
+        print(f"  - {os.path.basename(path)} → {os.path.relpath(manifest, ROOT)}")
+
+    # 원본 경로가 바뀌었으므로 스냅샷 인덱스를 새로 생성
+    main.rebuild_snapshot_index()
+    manifests = sum(os.path.getsize(p) for p in glob.glob(os.path.join(main.SNAPSHOT_DIR, "manifest_*.json")))
+    blobs = dir_size(main.BLOB_DIR) - blobs_before
+    print(f"✅ {converted}/{len(legacy)}개 변환: {before / 1024 / 1024:.1f} MB → manifest {manifests / 1024 / 1024:.1f} MB + 신규 blob {blobs / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="구버전 스냅샷을 manifest + blob 저장소로 변환")
+    parser.add_argument("--delete", action="store_true", help="검증된 원본 data_*.json 삭제")
+    parser.add_argument("--dry-run", action="store_true", help="변환 없이 대상만 출력")
+    args = parser.parse_args()
+    migrate(delete=args.delete, dry_run=args.dry_run)
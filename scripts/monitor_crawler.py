@@ -1,25 +1,41 @@
 import os
+import sys
 import json
 import time
+import hashlib
 import random
+import math
+import heapq
+import asyncio
+import threading
 import datetime
 import pytz
 import re
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
-from collections import Counter
+from urllib.parse import urlparse
+try:
+    import aiohttp  # 비동기 목록 수집 엔진 (없으면 Selenium 순차 수집)
+except ImportError:
+    aiohttp = None
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import replay  # noqa: E402  (응답 녹화/재생: REPLAY_MODE=record|replay)
+import browser  # noqa: E402  (경량 브라우저 프로필: LOAD_PROFILE=light|full)
+
 # --- [설정] ---
 SLACK_WEBHOOK_URL = os.environ.get("SLACK_WEBHOOK_URL")
 
 TZ_KST = pytz.timezone('Asia/Seoul')
 NOW = datetime.datetime.now(TZ_KST)
+# 재생 모드는 녹화 시점 기준 '어제'를 수집해야 날짜 필터가 같은 게시글을 고름
+if replay.REPLAY_MODE == "replay" and replay.recorded_at(): NOW = replay.recorded_at().astimezone(TZ_KST)
 YESTERDAY = NOW - datetime.timedelta(days=1)
 
 YESTERDAY_FULL = YESTERDAY.strftime('%Y-%m-%d') # 2026-02-01
@@ -27,6 +43,23 @@ YESTERDAY_DOT = YESTERDAY.strftime('%y.%m.%d')   # 25.02.01
 
 print(f"📅 타겟 날짜: {YESTERDAY_FULL}")
 
+# 목록 수집 엔진: async (HTTP 동시 수집, 필요한 페이지만 Selenium) | selenium (전체 Selenium 순차)
+COMMUNITY_ENGINE = os.environ.get("COMMUNITY_ENGINE", "async")
+HOST_CONCURRENCY = int(os.environ.get("COMMUNITY_HOST_CONCURRENCY", "2"))  # 호스트별 동시 요청 수
+POLITE_DELAY = float(os.environ.get("COMMUNITY_POLITE_DELAY", "1.0"))       # 같은 호스트 요청 시작 간격 (초, ±50% 랜덤)
+PREFETCH_PAGES = int(os.environ.get("COMMUNITY_PREFETCH", "2"))             # 처리 중인 페이지 뒤로 미리 요청할 페이지 수
+FETCH_RETRIES = 1
+# 워터마크 증분 수집: 이미 본 글(게시글 번호 ≤ 워터마크)에 닿으면 중단, 최근 글만 조회수/댓글수 갱신
+COMMUNITY_WATERMARK = os.environ.get("COMMUNITY_WATERMARK", "1") == "1"
+REFRESH_HOURS = float(os.environ.get("COMMUNITY_REFRESH_HOURS", "12"))   # 이 시간 이내 글은 이미 봤어도 다시 수집
+RETAIN_DAYS = 2                                                          # 상태 파일에 보관할 글 (어제 기준 이전 일수)
+STATE_FILE = 'data/monitoring/community_state.json'
+LOAD_STATS_FILE = 'data/monitoring/load_profile_stats.json'
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
 # --- [1. 브라우저 설정] ---
 def get_driver():
     chrome_options = Options()
@@ -36,162 +69,570 @@ def get_driver():
     chrome_options.add_argument("--lang=ko_KR")
     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
-    service = Service(ChromeDriverManager().install())
+    browser.chrome_options(chrome_options, [urlparse(b["url"]).netloc for b in BOARDS.values()])
+
+    service = Service(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
 
-# --- [2. 크롤러: 뽐뿌 (하이브리드 정밀 수집)] ---
-def get_ppomppu_posts(driver):
-    print("running ppomppu crawler...")
-    posts = []
-    base_url = "https://www.ppomppu.co.kr/zboard/zboard.php?id=phone&page={}"
-    
-    for page in range(1, 21): 
-        try:
-            driver.get(base_url.format(page))
-            time.sleep(random.uniform(1.0, 2.0))
+_driver = None
+_driver_lock = threading.Lock()
+_chromedriver_path = None
+
+def chromedriver_path():
+    # 재시작 때마다 webdriver-manager 버전 조회를 반복하지 않도록 경로 보관
+    global _chromedriver_path
+    if _chromedriver_path is None: _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
+def shared_driver():
+    # Selenium 은 폴백 페이지가 생길 때만 띄움 (수명 관리: 죽으면 재시작, 탐색 수/RSS 초과 시 교체)
+    global _driver
+    if _driver is None: _driver = browser.ManagedDriver(get_driver, "community")
+    return _driver.ensure()
+
+def close_driver():
+    global _driver
+    if _driver is not None:
+        try: _driver.quit()
+        except: pass
+        _driver = None
+
+def selenium_page(url):
+    with _driver_lock:
+        driver = shared_driver()
+        driver.get(replay.route(url))
+        time.sleep(random.uniform(1.0, 2.0))
+        html = driver.page_source
+        browser.log_page(driver, urlparse(url).netloc, url)
+        replay.record(url, html, rendered=True)
+        return html
+
+# --- [2. 파서: 뽐뿌 (하이브리드 정밀 수집)] ---
+PPOMPPU_URL = "https://www.ppomppu.co.kr/zboard/zboard.php?id=phone&page={}"
+
+POST_NO_RE = re.compile(r'[?&]no=(\d+)')
+
+def first_int(text):
+    # "1,234" / "[3/1]" 등 → 첫 숫자 (없으면 0): 어제 외 글까지 읽으므로 형식이 달라도 페이지 전체를 버리지 않음
+    m = re.search(r'\d[\d,]*', text or "")
+    return int(m.group().replace(',', '')) if m else 0
+
+def parse_ppomppu_page(html, page):
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = soup.find_all('tr') # 모든 행 탐색
+    posts, seen, newest = [], [], ""
+
+    for row in rows:
+        title_elem = row.select_one('font.list_title') or row.select_one('a')
+        if not title_elem: continue
+        
+        # [수정] 날짜 추출 우선순위 강화 (정확도 향상)
+        post_date, post_time = "", "00:00:00"
+        
+        # 1. .baseList-time 클래스가 있다면 가장 정확 (부모 td의 title 속성)
+        time_span = row.select_one('.baseList-time')
+        if time_span:
+            date_td = time_span.find_parent('td')
+            if date_td and date_td.get('title'):
+                raw_date, _, post_time = date_td['title'].partition(' ')
+                post_date = "20" + raw_date.replace('.', '-')
+        
+        # 2. 없다면 title 속성 직접 검색
+        if not post_date:
+            date_td = row.find('td', title=re.compile(r'\d{2}\.\d{2}\.\d{2}'))
+            if date_td:
+                raw_date, _, post_time = date_td['title'].partition(' ')
+                post_date = "20" + raw_date.replace('.', '-')
+        
+        # 3. 그래도 없다면 텍스트 정규식 (최후의 수단)
+        if not post_date:
+            date_match = re.search(r'\d{2}\.\d{2}\.\d{2}', row.text)
+            if date_match:
+                post_date = "20" + date_match.group().replace('.', '-')
+        newest = max(newest, post_date)
+
+        # 날짜가 있는 글은 모두 워터마크/갱신용으로 기록, 어제 글은 posts 에도 추가
+        if post_date:
+            link_elem = row.select_one('a[href*="view.php"]')
+            if not link_elem: continue
+            no_match = POST_NO_RE.search(link_elem['href'])
             
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            rows = soup.find_all('tr') # 모든 행 탐색
+            title = title_elem.text.strip()
+            link = "https://www.ppomppu.co.kr/zboard/" + link_elem['href']
             
-            valid_cnt_in_page = 0
+            # [수정] 조회수/댓글수 우선순위 강화 (숫자 꼬임 방지)
+            views, comments = 0, 0
             
-            for row in rows:
-                title_elem = row.select_one('font.list_title') or row.select_one('a')
-                if not title_elem: continue
-                
-                # [수정] 날짜 추출 우선순위 강화 (정확도 향상)
-                post_date = ""
-                
-                # 1. .baseList-time 클래스가 있다면 가장 정확 (부모 td의 title 속성)
-                time_span = row.select_one('.baseList-time')
-                if time_span:
-                    date_td = time_span.find_parent('td')
-                    if date_td and date_td.get('title'):
-                        raw_date = date_td['title'].split(' ')[0]
-                        post_date = "20" + raw_date.replace('.', '-')
-                
-                # 2. 없다면 title 속성 직접 검색
-                if not post_date:
-                    date_td = row.find('td', title=re.compile(r'\d{2}\.\d{2}\.\d{2}'))
-                    if date_td:
-                        raw_date = date_td['title'].split(' ')[0]
-                        post_date = "20" + raw_date.replace('.', '-')
-                
-                # 3. 그래도 없다면 텍스트 정규식 (최후의 수단)
-                if not post_date:
-                    date_match = re.search(r'\d{2}\.\d{2}\.\d{2}', row.text)
-                    if date_match:
-                        post_date = "20" + date_match.group().replace('.', '-')
-
-                # 날짜 일치 확인
-                if post_date == YESTERDAY_FULL:
-                    link_elem = row.select_one('a[href*="view.php"]')
-                    if not link_elem: continue
-                    
-                    title = title_elem.text.strip()
-                    link = "https://www.ppomppu.co.kr/zboard/" + link_elem['href']
-                    
-                    # [수정] 조회수/댓글수 우선순위 강화 (숫자 꼬임 방지)
-                    views, comments = 0, 0
-                    
-                    # 1. 클래스로 찾기 (가장 정확)
-                    view_tag = row.select_one('.baseList-views')
-                    cmt_tag = row.select_one('.baseList-c') or row.select_one('.list_comment2')
-                    
-                    if view_tag:
-                        views = int(view_tag.text.strip().replace(',', '') or 0)
-                    else:
-                        # 2. 텍스트에서 찾기 (리스크 있음)
-                        views_match = re.findall(r'\d{1,3}(?:,\d{3})*', row.text)
-                        if views_match: views = int(views_match[-1].replace(',', ''))
-                    
-                    if cmt_tag:
-                        comments = int(cmt_tag.text.strip().replace(',', '') or 0)
-
-                    posts.append({'source': 'ppomppu', 'title': title, 'link': link, 'views': views, 'comments': comments})
-                    valid_cnt_in_page += 1
+            # 1. 클래스로 찾기 (가장 정확)
+            view_tag = row.select_one('.baseList-views')
+            cmt_tag = row.select_one('.baseList-c') or row.select_one('.list_comment2')
             
-            if valid_cnt_in_page == 0 and page > 10:
-                print("  - No more posts found. Stopping.")
-                break
-
-        except Exception as e:
-            print(f"Err Ppomppu p{page}: {e}")
+            if view_tag:
+                views = first_int(view_tag.text)
+            else:
+                # 2. 텍스트에서 찾기 (리스크 있음)
+                views_match = re.findall(r'\d{1,3}(?:,\d{3})*', row.text)
+                if views_match: views = int(views_match[-1].replace(',', ''))
             
-    return posts
+            if cmt_tag:
+                comments = first_int(cmt_tag.text)
 
-# --- [3. 크롤러: 디시 (기존 유지)] ---
-def get_dc_posts(driver):
-    print("running dc crawler...")
-    posts = []
-    base_url = "https://gall.dcinside.com/mgallery/board/lists/?id=mvnogallery&page={}"
+            post = {'source': 'ppomppu', 'title': title, 'link': link, 'views': views, 'comments': comments}
+            if no_match: seen.append({**post, 'no': int(no_match.group(1)), 'date': post_date, 'ts': f"{post_date} {post_time or '00:00:00'}"})
+            if post_date == YESTERDAY_FULL: posts.append(post)
+
+    # 어제 글이 없고 (10페이지 이후이거나) 남은 글이 모두 어제보다 오래됐으면 중단
+    stop = not posts and (page > 10 or bool(newest) and newest < YESTERDAY_FULL)
+    return {"posts": posts, "seen": seen, "stop": stop}
+
+# --- [3. 파서: 디시 (기존 유지)] ---
+DC_URL = "https://gall.dcinside.com/mgallery/board/lists/?id=mvnogallery&page={}"
+
+def parse_dc_page(html, page):
+    soup = BeautifulSoup(html, 'html.parser')
+    page_title = soup.title.get_text() if soup.title else ""
+    if "디시인사이드입니다" in page_title and "알뜰폰" not in page_title:
+        return {"posts": [], "seen": [], "stop": True}
+
+    rows = soup.select('tr.ub-content.us-post')
+    if not rows: return {"posts": [], "seen": [], "stop": True}
+        
+    posts, seen, stop_crawling = [], [], False
     
-    for page in range(1, 51):
-        try:
-            driver.get(base_url.format(page))
-            time.sleep(random.uniform(1.0, 2.0))
+    for row in rows:
+        if row.get('data-type') == 'icon_notice': continue
+        date_tag = row.select_one('.gall_date')
+        if not date_tag or not date_tag.get('title'): continue
+        
+        post_date = date_tag['title'].split(' ')[0]
+        
+        if post_date >= YESTERDAY_FULL:
+            title_tag = row.select_one('.gall_tit > a')
+            if not title_tag: continue
+            title = title_tag.text.strip()
+            link = "https://gall.dcinside.com" + title_tag['href']
+            views_tag = row.select_one('.gall_count')
+            views = int(views_tag.text.strip().replace(',', '')) if views_tag and views_tag.text.strip().isdigit() else 0
+            reply_tag = row.select_one('.reply_num')
+            comments = first_int(reply_tag.text) if reply_tag else 0
             
-            if "디시인사이드입니다" in driver.title and "알뜰폰" not in driver.title:
-                break
+            post = {'source': 'dc', 'title': title, 'link': link, 'views': views, 'comments': comments}
+            no_match = POST_NO_RE.search(title_tag['href'])
+            if no_match: seen.append({**post, 'no': int(no_match.group(1)), 'date': post_date, 'ts': date_tag['title']})
+            if post_date == YESTERDAY_FULL: posts.append(post)
+        else:
+            stop_crawling = True
+    
+    return {"posts": posts, "seen": seen, "stop": stop_crawling}
 
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            rows = soup.select('tr.ub-content.us-post')
-            
-            if not rows: break
-                
-            stop_crawling = False
-            
-            for row in rows:
-                if row.get('data-type') == 'icon_notice': continue
-                date_tag = row.select_one('.gall_date')
-                if not date_tag or not date_tag.get('title'): continue
-                
-                post_date = date_tag['title'].split(' ')[0]
-                
-                if post_date == YESTERDAY_FULL:
-                    title_tag = row.select_one('.gall_tit > a')
-                    if not title_tag: continue
-                    title = title_tag.text.strip()
-                    link = "https://gall.dcinside.com" + title_tag['href']
-                    views_tag = row.select_one('.gall_count')
-                    views = int(views_tag.text.strip().replace(',', '')) if views_tag and views_tag.text.strip().isdigit() else 0
-                    reply_tag = row.select_one('.reply_num')
-                    comments = int(reply_tag.text.strip('[]')) if reply_tag else 0
-                    
-                    posts.append({'source': 'dc', 'title': title, 'link': link, 'views': views, 'comments': comments})
-                elif post_date < YESTERDAY_FULL:
-                    stop_crawling = True
-            
-            if stop_crawling: break
-            
+# 게시판 정의 (stop_on_error: 페이지 처리 오류 시 수집 중단 여부 — 기존 동작 유지)
+BOARDS = {
+    "ppomppu": {"url": PPOMPPU_URL, "max_pages": 20, "parse": parse_ppomppu_page, "stop_on_error": False, "label": "Ppomppu"},
+    "dc": {"url": DC_URL, "max_pages": 50, "parse": parse_dc_page, "stop_on_error": True, "label": "DC"},
+}
+
+# --- [3-1. 워터마크 상태: 게시판별 최대 글 번호 + 최근 글 캐시] ---
+def use_watermark():
+    # 재생 모드는 녹화 당시 페이지 전체를 다시 훑어야 하므로 워터마크 미사용
+    return COMMUNITY_WATERMARK and replay.REPLAY_MODE != "replay"
+
+def load_state():
+    if not use_watermark() or not os.path.exists(STATE_FILE): return {}
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f: return json.load(f)
+    except: return {}
+
+def save_state(state):
+    if not use_watermark(): return
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    with open(STATE_FILE, 'w', encoding='utf-8') as f: json.dump(state, f, ensure_ascii=False)
+
+def page_reached_watermark(result, board_state):
+    # 새 글(번호 > 워터마크)도, 갱신 구간(REFRESH_HOURS 이내) 글도 없는 페이지면 이후는 이미 본 글
+    if not board_state.get("max_no") or not result["seen"]: return False
+    cutoff = (NOW - datetime.timedelta(hours=REFRESH_HOURS)).strftime('%Y-%m-%d %H:%M:%S')
+    return all(r['no'] <= board_state["max_no"] and r['ts'] < cutoff for r in result["seen"])
+
+def merge_board(state, name, seen, posts):
+    # 이번에 본 글로 캐시 갱신 (조회수/댓글수는 최신값), 어제 글 목록은 캐시에서 구성
+    if not use_watermark(): return posts
+    board_state = state.setdefault(name, {"max_no": 0, "updated": "", "posts": {}})
+    for r in seen: board_state["posts"][str(r['no'])] = r
+    board_state["max_no"] = max([board_state["max_no"]] + [r['no'] for r in seen])
+    board_state["updated"] = NOW.isoformat()
+    keep_from = (YESTERDAY - datetime.timedelta(days=RETAIN_DAYS)).strftime('%Y-%m-%d')
+    board_state["posts"] = {k: v for k, v in board_state["posts"].items() if v['date'] >= keep_from}
+    cached = sorted((v for v in board_state["posts"].values() if v['date'] == YESTERDAY_FULL), key=lambda v: -v['no'])
+    # 번호를 못 읽은 어제 글은 캐시에 없으므로 이번 수집분에서 보충
+    cached_links = {v['link'] for v in cached}
+    return [{k: v[k] for k in ('source', 'title', 'link', 'views', 'comments')} for v in cached] + [p for p in posts if p['link'] not in cached_links]
+
+# --- [3-2. Selenium 순차 수집 (COMMUNITY_ENGINE=selenium 또는 aiohttp 미설치)] ---
+def crawl_board_selenium(name, state=None):
+    board, state = BOARDS[name], state if state is not None else {}
+    print(f"running {name} crawler (selenium)...")
+    posts, seen = [], []
+    for page in range(1, board["max_pages"] + 1):
+        try:
+            result = board["parse"](selenium_page(board["url"].format(page)), page)
+            posts += result["posts"]; seen += result["seen"]
+            if result["stop"]:
+                if name == "ppomppu": print("  - No more posts found. Stopping.")
+                break
+            if page_reached_watermark(result, state.get(name, {})):
+                print(f"  - {name}: 워터마크 도달 ({page}페이지)")
+                break
         except Exception as e:
-            print(f"Err DC p{page}: {e}")
-            break
-            
-    return posts
+            print(f"Err {board['label']} p{page}: {e}")
+            if board["stop_on_error"]: break
+    return merge_board(state, name, seen, posts)
+
+def get_ppomppu_posts(state=None):
+    return crawl_board_selenium("ppomppu", state)
+
+def get_dc_posts(state=None):
+    return crawl_board_selenium("dc", state)
+
+# --- [3-3. 비동기 수집 엔진: 호스트별 동시성 제한 + 요청 간격 + 선행 요청 + 조기 취소] ---
+def sniff_charset(raw):
+    m = re.search(rb'charset=["\']?([\w-]+)', raw[:4096], re.I)
+    return m.group(1).decode("ascii") if m else "utf-8"
+
+async def fetch_page(session, gate, url):
+    async with gate["sem"]:
+        async with gate["lock"]:
+            wait = gate["next"] - time.monotonic()
+            if wait > 0: await asyncio.sleep(wait)
+            gate["next"] = time.monotonic() + POLITE_DELAY * random.uniform(0.5, 1.5)
+        for attempt in range(FETCH_RETRIES + 1):
+            try:
+                async with session.get(replay.route(url)) as resp:
+                    raw = await resp.read()
+                    try: html = raw.decode(resp.charset or sniff_charset(raw), errors="replace")
+                    except LookupError: html = raw.decode("utf-8", errors="replace")
+                    replay.record(url, html, resp.status, resp.content_type)
+                    return html if resp.status == 200 else None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == FETCH_RETRIES:
+                    print(f"  - HTTP 실패 {url}: {e.__class__.__name__}")
+                    return None
+                await asyncio.sleep(1 + attempt)
+
+async def crawl_board_async(session, gates, name, state):
+    board = BOARDS[name]
+    print(f"running {name} crawler (async)...")
+    gate = gates.setdefault(urlparse(board["url"]).netloc, {"sem": asyncio.Semaphore(HOST_CONCURRENCY), "lock": asyncio.Lock(), "next": 0.0})
+    loop = asyncio.get_running_loop()
+    tasks, posts, seen, fallback, page = {}, [], [], 0, 0
+    try:
+        for page in range(1, board["max_pages"] + 1):
+            # 현재 페이지 + PREFETCH_PAGES 장을 미리 요청 (결과는 페이지 순서대로 처리)
+            for ahead in range(page, min(page + PREFETCH_PAGES, board["max_pages"]) + 1):
+                if ahead not in tasks: tasks[ahead] = asyncio.ensure_future(fetch_page(session, gate, board["url"].format(ahead)))
+            html = await tasks.pop(page)
+            try:
+                # HTTP 실패 또는 표 자체가 없는 응답(차단/스크립트 렌더링)은 Selenium 으로 재수집
+                if html is None or "<tr" not in html.lower():
+                    fallback += 1
+                    html = await loop.run_in_executor(None, selenium_page, board["url"].format(page))
+                result = board["parse"](html, page)
+            except Exception as e:
+                print(f"Err {board['label']} p{page}: {e}")
+                if board["stop_on_error"]: break
+                continue
+            posts += result["posts"]; seen += result["seen"]
+            if result["stop"] or page_reached_watermark(result, state.get(name, {})): break
+    finally:
+        # 중단 시점 이후로 미리 요청해 둔 페이지는 취소
+        for task in tasks.values(): task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    print(f"  - {name}: 이번 수집 어제 글 {len(posts)}건 ({page}페이지에서 중단, 선행 요청 취소 {len(tasks)}건, Selenium 폴백 {fallback}건)")
+    return merge_board(state, name, seen, posts)
+
+async def crawl_boards_async(state):
+    timeout = aiohttp.ClientTimeout(total=20)
+    connector = aiohttp.TCPConnector(limit_per_host=HOST_CONCURRENCY)
+    async with aiohttp.ClientSession(headers=HTTP_HEADERS, timeout=timeout, connector=connector) as session:
+        gates = {}
+        return await asyncio.gather(crawl_board_async(session, gates, "ppomppu", state), crawl_board_async(session, gates, "dc", state))
+
+def crawl_communities():
+    state = load_state()
+    if COMMUNITY_ENGINE == "async" and aiohttp is not None:
+        p_posts, d_posts = asyncio.run(crawl_boards_async(state))
+    else:
+        if COMMUNITY_ENGINE == "async": print("⚠️ aiohttp 미설치: Selenium 순차 수집으로 진행")
+        p_posts, d_posts = get_ppomppu_posts(state), get_dc_posts(state)
+    save_state(state)
+    return p_posts, d_posts
 
 # --- [4. 분석 로직] ---
-def extract_top_keywords(df):
-    if df.empty: return []
-    all_titles = " ".join(df['title'].tolist())
-    all_titles = re.sub(r'[^\w\s]', ' ', all_titles)
-    words = all_titles.split()
-    
-    # [수정] 불용어 추가 (있음, 알뜰 등)
-    stopwords = set([
-        '질문', '후기', '정보', '요금제', '알뜰폰', '추천', '있나요', '나요', '가요', '건가요',
-        '오늘', '내일', '이번달', '2월', '1월', '근데', '진짜', '혹시', '아니', '너무',
-        '유심', '번호이동', '기변', '신규', '개통', '모바일', '사람', '생각', '지금', '어제',
-        '약정', '결합', '할인', '카드', '데이터', '무제한', '평생', '개월', '년',
-        'skt', 'kt', 'lg', 'lgu', 'sk', 'kt망', 'lgu+', 'u+', 'sk망', '헬로',
-        'vs', '이거', '저거', '그거', '뭐야', '시발', '존나', 'ㅋㅋ', 'ㅎㅎ', 'ㅠㅠ',
-        '문의', '질문좀', '대해', '관련', '어떤가요', '무슨', '어디', '어떻게',
-        '선택', '위약금', '조건', '정책', '비교', '변경', '이동', '사용', '가입', '해지',
-        '있음', '알뜰', '요금', '번호', '이동', '통신사' # 추가된 노이즈
-    ])
-    filtered_words = [w for w in words if len(w) >= 2 and w.lower() not in stopwords]
-    return Counter(filtered_words).most_common(10)
+# 브랜드 별칭: 문자열 또는 {"alias", "priority", "boundary"} (같은 위치에서 겹치면 priority → 긴 별칭 우선)
+# boundary: both (앞뒤가 같은 문자 종류면 불일치) | left (앞만 검사) | none
+#   기본값: 영문/숫자 별칭 both, 2글자 이하 별칭 left, 그 외 none
+BRANDS = {
+    '세븐모바일': ['세븐모바일', '7모', 'sk7', 'sk텔링크'],
+    '모빙': ['모빙'],
+    '리브엠': ['리브엠', '리브모바일', 'kb'],
+    '이야기': ['이야기', '이야기모바일'],
+    '헬로모바일': ['헬로모바일', '헬모'],
+    '프리티': ['프리티'],
+    '티플러스': ['티플러스', '티플'],
+    '티다이렉트': ['티다이렉트', '티다', 't다이렉트', 't다'],
+    'KT엠모바일': ['kt엠모바일', '엠모바일', '엠모', 'ktm'],
+    '스카이라이프': ['스카이라이프', '스카라', 'skylife'],
+    '유모바일': ['유모바일', '유모', 'u모바일', '유알모'],
+    'SKT_Air': ['skt에어', 'skt air']
+}
+
+def _char_class(ch):
+    # 한글 제목은 띄어쓰기 없이 영문/한글이 붙으므로 경계는 "같은 문자 종류가 이어지는가"로 판단
+    if re.match(r'[0-9a-z]', ch): return '0-9a-z'
+    if '가' <= ch <= '힣': return '가-힣'
+    return None
+
+def compile_brand_matcher(brands):
+    aliases = {}
+    for order, (brand, keywords) in enumerate(brands.items()):
+        for k in keywords:
+            spec = k if isinstance(k, dict) else {"alias": k}
+            alias = spec["alias"].lower()
+            boundary = spec.get("boundary") or ("both" if re.fullmatch(r'[0-9a-z ]+', alias) else "left" if len(alias) <= 2 else "none")
+            entry = (brand, spec.get("priority", 0), order, boundary)
+            # 같은 별칭이 여러 브랜드에 있으면 priority 가 높은 쪽 (같으면 먼저 정의된 쪽)
+            if alias not in aliases or (entry[1], -entry[2]) > (aliases[alias][1], -aliases[alias][2]): aliases[alias] = entry
+
+    parts = []
+    for alias, (_, priority, _, boundary) in sorted(aliases.items(), key=lambda kv: (-kv[1][1], -len(kv[0]), kv[0])):
+        pattern = re.escape(alias)
+        head, tail = _char_class(alias[0]), _char_class(alias[-1])
+        if boundary in ("both", "left") and head: pattern = f"(?<![{head}]){pattern}"
+        if boundary == "both" and tail: pattern = f"{pattern}(?![{tail}])"
+        parts.append(pattern)
+    return {"pattern": re.compile("|".join(parts)) if parts else None, "aliases": {a: e[0] for a, e in aliases.items()}}
+
+BRAND_MATCHER = compile_brand_matcher(BRANDS)
+
+def match_brands(title, matcher=BRAND_MATCHER):
+    # 제목 1회 스캔: [(브랜드, 별칭, 시작, 끝)] — 겹치는 별칭은 한 번만 (예: '티다이렉트' 안의 '티다')
+    if not matcher["pattern"] or not title: return []
+    return [(matcher["aliases"][m.group()], m.group(), m.start(), m.end()) for m in matcher["pattern"].finditer(title.lower())]
+
+# [수정] 불용어 추가 (있음, 알뜰 등)
+STOPWORDS = set([
+    '질문', '후기', '정보', '요금제', '알뜰폰', '추천', '있나요', '나요', '가요', '건가요',
+    '오늘', '내일', '이번달', '2월', '1월', '근데', '진짜', '혹시', '아니', '너무',
+    '유심', '번호이동', '기변', '신규', '개통', '모바일', '사람', '생각', '지금', '어제',
+    '약정', '결합', '할인', '카드', '데이터', '무제한', '평생', '개월', '년',
+    'skt', 'kt', 'lg', 'lgu', 'sk', 'kt망', 'lgu+', 'u+', 'sk망', '헬로',
+    'vs', '이거', '저거', '그거', '뭐야', '시발', '존나', 'ㅋㅋ', 'ㅎㅎ', 'ㅠㅠ',
+    '문의', '질문좀', '대해', '관련', '어떤가요', '무슨', '어디', '어떻게',
+    '선택', '위약금', '조건', '정책', '비교', '변경', '이동', '사용', '가입', '해지',
+    '있음', '알뜰', '요금', '번호', '이동', '통신사' # 추가된 노이즈
+])
+
+# 조사/어미 (긴 것부터 제거, 남는 어간이 2글자 이상일 때만)
+KOREAN_SUFFIXES = sorted([
+    '에서는', '으로는', '이라도', '에서', '으로', '까지', '부터', '이랑', '에게', '한테', '이나', '보다', '처럼', '인데',
+    '은', '는', '이', '가', '을', '를', '에', '도', '만', '의', '로', '와', '과', '랑',
+], key=len, reverse=True)
+TOKEN_RE = re.compile(r'[0-9a-z가-힣+]+')
+SKETCH_CAPACITY = 2000  # n-gram 별로 추적하는 후보 수 (메모리 상한)
+TREND_DAYS = 7          # 급상승 판단 기준 기간 (히스토리 최근 N일 평균)
+TREND_MIN_COUNT = 3     # 급상승 후보 최소 언급 수
+HISTORY_TERMS = 200     # 히스토리에 저장할 n-gram 수 (다음 실행의 기준값)
+
+def strip_suffix(token):
+    if not '가' <= token[-1] <= '힣': return token
+    for suffix in KOREAN_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2: return token[:-len(suffix)]
+    return token
+
+def tokenize_title(title):
+    tokens = []
+    for raw in TOKEN_RE.findall(title.lower()):
+        if raw in STOPWORDS: continue
+        token = strip_suffix(raw)
+        if len(token) >= 2 and token not in STOPWORDS: tokens.append(token)
+    return tokens
+
+# Space-Saving top-k 스케치: 후보가 가득 차면 최소 카운트 항목을 교체
+# 새 항목은 교체된 카운트를 물려받으므로(errors) 보고 시에는 하한값(count - error)을 사용
+def new_sketch(capacity=SKETCH_CAPACITY):
+    return {"capacity": capacity, "counts": {}, "errors": {}, "heap": []}
+
+def sketch_add(sketch, term, n=1):
+    counts, errors, heap = sketch["counts"], sketch["errors"], sketch["heap"]
+    if term in counts: counts[term] += n
+    elif len(counts) < sketch["capacity"]: counts[term], errors[term] = n, 0
+    else:
+        # 힙에는 갱신 전 카운트가 남아 있으므로 현재 값과 같은 항목이 나올 때까지 버림
+        while True:
+            count, victim = heapq.heappop(heap)
+            if counts.get(victim) == count: break
+        del counts[victim], errors[victim]
+        counts[term], errors[term] = count + n, count
+    heapq.heappush(heap, (counts[term], term))
+    if len(heap) > 8 * sketch["capacity"]:
+        sketch["heap"] = [(c, t) for t, c in counts.items()]
+        heapq.heapify(sketch["heap"])
+
+def sketch_top(sketch, k):
+    guaranteed = ((t, c - sketch["errors"][t]) for t, c in sketch["counts"].items())
+    return sorted((x for x in guaranteed if x[1] > 0), key=lambda x: (-x[1], x[0]))[:k]
+
+def keyword_stats(titles, capacity=SKETCH_CAPACITY):
+    # 제목을 하나씩 흘려보내며 집계 (몇 달 치 백필도 메모리는 capacity 로 고정), 글 1건당 용어 1회
+    stats = {"titles": 0, "unigrams": new_sketch(capacity), "bigrams": new_sketch(capacity)}
+    for title in titles:
+        stats["titles"] += 1
+        tokens = tokenize_title(title or "")
+        for token in dict.fromkeys(tokens): sketch_add(stats["unigrams"], token)
+        for bigram in dict.fromkeys(f"{a} {b}" for a, b in zip(tokens, tokens[1:])): sketch_add(stats["bigrams"], bigram)
+    return stats
+
+def trending_terms(term_counts, history, k=5):
+    # 최근 TREND_DAYS 일 평균 대비 증가량 / sqrt(평균+1): 평소 많이 나오는 용어의 소폭 증가는 낮게 평가
+    past = [h for h in history if h['date'] < YESTERDAY_FULL][-TREND_DAYS:]
+    if not past: return []
+    scored = []
+    for term, count in term_counts.items():
+        if count < TREND_MIN_COUNT: continue
+        base = sum(h.get('term_counts', h.get('top_keywords', {})).get(term, 0) for h in past) / len(past)
+        score = (count - base) / math.sqrt(base + 1)
+        if score > 0: scored.append((term, count, base, score))
+    return sorted(scored, key=lambda x: (-x[3], x[0]))[:k]
+
+# --- [4-1. 히스토리 저장소: 월별 JSONL 추가 기록 + 7/30일 롤링 집계] ---
+# daily/<YYYY-MM>.jsonl : 하루 요약 1줄 (같은 날짜 재실행은 새 줄 추가, 읽을 때 마지막 줄 우선)
+# posts/<YYYY-MM>.jsonl : 원본 게시글 1건 1줄 (date 포함)
+# rollups.json          : 최근 ROLLUP_WINDOWS 일 볼륨/SOV 합계 (최근 max(ROLLUP_WINDOWS)일 요약만 보관해 갱신)
+HISTORY_DIR = 'data/monitoring/history'
+ROLLUP_WINDOWS = (7, 30)
+LEGACY_HISTORY_FILE = 'data/dashboard_history.json'
+
+def history_path(kind, date):
+    return os.path.join(HISTORY_DIR, kind, f"{date[:7]}.jsonl")
+
+def append_jsonl(path, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for row in rows: f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+def history_months(start, end):
+    year, month = int(start[:4]), int(start[5:7])
+    while f"{year:04d}-{month:02d}" <= end[:7]:
+        yield f"{year:04d}-{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def read_jsonl(kind, start, end):
+    # 요청 기간에 걸친 월 파일만 읽음 (중단된 실행이 남긴 깨진 줄은 건너뜀)
+    for month in history_months(start, end):
+        path = os.path.join(HISTORY_DIR, kind, f"{month}.jsonl")
+        if not os.path.exists(path): continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try: row = json.loads(line)
+                except: continue
+                if start <= row.get('date', '') <= end: yield row
+
+def read_history(start, end):
+    entries = {row['date']: row for row in read_jsonl('daily', start, end)}
+    return [entries[d] for d in sorted(entries)]
+
+def read_posts(start, end):
+    posts = {}
+    for row in read_jsonl('posts', start, end): posts[(row['date'], row.get('link'))] = row
+    return list(posts.values())
+
+def sum_counts(dicts):
+    total = {}
+    for d in dicts:
+        for key, value in d.items(): total[key] = total.get(key, 0) + value
+    return total
+
+def update_rollups(entry):
+    path = os.path.join(HISTORY_DIR, 'rollups.json')
+    rollups = {"days": []}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            try: rollups = json.load(f)
+            except: pass
+    days = [d for d in rollups.get("days", []) if d['date'] != entry['date']]
+    days.append({"date": entry['date'], "volume": entry['total_volume'], "sov": entry['brand_sov']})
+    days.sort(key=lambda d: d['date'])
+    latest = datetime.date.fromisoformat(days[-1]['date'])
+
+    def since(n): return (latest - datetime.timedelta(days=n - 1)).isoformat()
+    days = [d for d in days if d['date'] >= since(max(ROLLUP_WINDOWS))]
+    windows = {}
+    for n in ROLLUP_WINDOWS:
+        window = [d for d in days if d['date'] >= since(n)]
+        sov = sum_counts(d['sov'] for d in window)
+        mentions = sum(sov.values())
+        windows[str(n)] = {
+            "days": len(window),
+            "volume": sum_counts(d['volume'] for d in window),
+            "sov": sov,
+            "sov_share": {b: round(c / mentions, 4) for b, c in sov.items()} if mentions else {},
+        }
+    rollups = {"updated": days[-1]['date'], "windows": windows, "days": days}
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f: json.dump(rollups, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return rollups
+
+def post_index_path(date):
+    # 날짜별 링크 → 마지막으로 쓴 줄의 지문 (월 파일을 다시 읽지 않고 중복 판단)
+    return os.path.join(HISTORY_DIR, 'posts', 'index', f"{date}.json")
+
+def row_fingerprint(row):
+    return hashlib.sha1(json.dumps(row, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def save_history(entry, posts):
+    append_jsonl(history_path('daily', entry['date']), [entry])
+    # 같은 날짜로 다시 실행해도 새 글이나 조회수/댓글수가 바뀐 글만 추가
+    index_path = post_index_path(entry['date'])
+    last = {}
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            try: last = json.load(f)
+            except: pass
+    rows = []
+    for p in posts:
+        row = {"date": entry['date'], **p}
+        fp = row_fingerprint(row)
+        if last.get(row.get('link') or '') == fp: continue
+        last[row.get('link') or ''] = fp
+        rows.append(row)
+    if rows:
+        append_jsonl(history_path('posts', entry['date']), rows)
+        # 줄을 먼저 쓰고 지문 저장: 중간에 중단되면 다음 실행에서 같은 줄이 한 번 더 추가될 뿐 (읽을 때 마지막 줄 기준)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp = index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump(last, f, ensure_ascii=False)
+        os.replace(tmp, index_path)
+    return update_rollups(entry)
+
+def import_legacy_history():
+    # 저장소가 비어 있을 때 1회: dashboard_history.json + monitoring/data_<date>.json 을 옮겨 담음 (원본은 유지)
+    if os.path.isdir(os.path.join(HISTORY_DIR, 'daily')): return
+    legacy = []
+    if os.path.exists(LEGACY_HISTORY_FILE):
+        with open(LEGACY_HISTORY_FILE, 'r', encoding='utf-8') as f:
+            try: legacy = sorted(json.load(f), key=lambda x: x['date'])
+            except: legacy = []
+    for entry in legacy:
+        posts = []
+        raw_file = f"data/monitoring/data_{entry['date']}.json"
+        if os.path.exists(raw_file):
+            with open(raw_file, 'r', encoding='utf-8') as f:
+                try: posts = json.load(f)
+                except: pass
+        save_history(entry, posts)
+    if legacy: print(f"📦 기존 히스토리 {len(legacy)}일치 이관 → {HISTORY_DIR}")
 
 def analyze_and_notify(p_posts, d_posts):
     total_posts = p_posts + d_posts
@@ -207,32 +648,14 @@ def analyze_and_notify(p_posts, d_posts):
     d_status = "🔴 과열" if d_cnt >= 600 else ("🟢 평온" if d_cnt < 300 else "🟡 활발")
 
     # 1. 브랜드 점유율 (세븐모바일 고정 노출 로직 추가)
-    brands = {
-        '세븐모바일': ['세븐모바일', '7모', 'sk7', 'sk텔링크'],
-        '모빙': ['모빙'],
-        '리브엠': ['리브엠', '리브모바일', 'kb'],
-        '이야기': ['이야기', '이야기모바일'],
-        '헬로모바일': ['헬로모바일', '헬모'],
-        '프리티': ['프리티'],
-        '티플러스': ['티플러스', '티플'],
-        '티다이렉트': ['티다이렉트', '티다', 't다이렉트', 't다'],
-        'KT엠모바일': ['kt엠모바일', '엠모바일', '엠모', 'ktm'],
-        '스카이라이프': ['스카이라이프', '스카라', 'skylife'],
-        '유모바일': ['유모바일', '유모', 'u모바일', '유알모'],
-        'SKT_Air': ['skt에어', 'skt air']
-    }
-    
-    brand_counts = {}
+    brand_counts = {b_name: 0 for b_name in BRANDS}
     seven_links = [] # 세븐모바일 링크 수집
 
-    # 카운팅 먼저 수행
-    for b_name, keywords in brands.items():
-        filtered = df[df['title'].apply(lambda x: any(k in x.lower() for k in keywords))]
-        brand_counts[b_name] = int(len(filtered))
-        
-        if b_name == '세븐모바일' and len(filtered) > 0:
-            for _, row in filtered.iterrows():
-                seven_links.append(f"  └ <{row['link']}|{row['title']}>")
+    # 카운팅 먼저 수행 (제목당 1회 매칭, 브랜드별로는 글 1건당 1회 집계)
+    for title, link in zip(df['title'], df['link']):
+        for b_name in {hit[0] for hit in match_brands(title)}:
+            brand_counts[b_name] += 1
+            if b_name == '세븐모바일': seven_links.append(f"  └ <{link}|{title}>")
 
     # [수정] 출력 순서 제어 (세븐모바일 1순위, 나머지 >0 건만)
     sov_lines = []
@@ -249,11 +672,15 @@ def analyze_and_notify(p_posts, d_posts):
 
     sov_msg = "\n".join(sov_lines)
 
-    # 2. 핫 키워드 (Top 10)
-    top_keywords = extract_top_keywords(df)
+    # 2. 핫 키워드 (Top 10) + 연관 키워드 (2-gram Top 5)
+    stats = keyword_stats(df['title'])
+    top_keywords = sketch_top(stats["unigrams"], 10)
+    top_bigrams = sketch_top(stats["bigrams"], 5)
+    term_counts = dict(sketch_top(stats["unigrams"], HISTORY_TERMS // 2) + sketch_top(stats["bigrams"], HISTORY_TERMS // 2))
     keyword_msg = ""
     for word, count in top_keywords:
         keyword_msg += f"• {word}: {count}건\n"
+    if top_bigrams: keyword_msg += "• 연관: " + ", ".join(f"{w}({c})" for w, c in top_bigrams) + "\n"
     if not keyword_msg: keyword_msg = "• 특이사항 없음"
 
     # Top 5 포맷팅
@@ -272,29 +699,23 @@ def analyze_and_notify(p_posts, d_posts):
     p_msg, p_top5 = format_list(pd.DataFrame(p_posts))
     d_msg, d_top5 = format_list(pd.DataFrame(d_posts))
 
-    # 데이터 저장
-    history_file = 'data/dashboard_history.json'
-    history_data = []
-    if os.path.exists(history_file):
-        with open(history_file, 'r', encoding='utf-8') as f:
-            try: history_data = json.load(f)
-            except: pass
-    
+    # 3. 급상승 키워드 (히스토리 기준값 대비, 기준 기간의 월 파일만 읽음)
+    import_legacy_history()
+    history_data = read_history((YESTERDAY - datetime.timedelta(days=TREND_DAYS)).strftime('%Y-%m-%d'), YESTERDAY_FULL)
+    trends = trending_terms(term_counts, history_data)
+    trend_msg = "\n".join(f"• {term}: {count}건 (평균 {base:.1f}){' 🆕' if base == 0 else ''}" for term, count, base, _ in trends) or "• 특이사항 없음"
+
     today_entry = {
         "date": YESTERDAY_FULL,
         "total_volume": { "ppomppu": p_cnt, "dc": d_cnt },
         "brand_sov": brand_counts,
         "top_keywords": dict(top_keywords),
+        "term_counts": term_counts,
         "top_posts": { "ppomppu": p_top5, "dc": d_top5 }
     }
     
-    history_data = [d for d in history_data if d['date'] != YESTERDAY_FULL]
-    history_data.append(today_entry)
-    history_data.sort(key=lambda x: x['date'])
-    
-    os.makedirs('data', exist_ok=True)
-    with open(history_file, 'w', encoding='utf-8') as f:
-        json.dump(history_data, f, ensure_ascii=False, indent=4)
+    # 데이터 저장 (하루치 요약/원본 추가 기록 + 롤링 집계 갱신)
+    week = save_history(today_entry, total_posts)["windows"]["7"]
 
     # 슬랙 전송
     seven_block = ""
@@ -307,12 +728,15 @@ def analyze_and_notify(p_posts, d_posts):
 *🌡️ 커뮤니티 활성도*
 • 뽐뿌: {p_status} ({p_cnt}개)
 • 디시: {d_status} ({d_cnt}개)
+• 최근 {week['days']}일: 뽐뿌 {week['volume'].get('ppomppu', 0)}개 / 디시 {week['volume'].get('dc', 0)}개
 
 *📈 브랜드 언급량 (SOV)*
 {sov_msg}{seven_block}
 
 *🔥 핫 키워드 (Top 10)*
 {keyword_msg}
+*🚀 급상승 키워드 (최근 {TREND_DAYS}일 평균 대비)*
+{trend_msg}
 
 *1️⃣ 뽐뿌 휴대폰포럼 (Top 5)*
 {p_msg}
@@ -323,22 +747,17 @@ def analyze_and_notify(p_posts, d_posts):
 👉 <https://rodolfochoi911-lgtm.github.io/competitor-monitor/|웹 대시보드 확인하기>
     """
     
-    if SLACK_WEBHOOK_URL:
+    if SLACK_WEBHOOK_URL and replay.REPLAY_MODE != "replay":
         requests.post(SLACK_WEBHOOK_URL, json={"text": slack_text})
 
-    # 백업 저장
-    os.makedirs('data/monitoring', exist_ok=True)
-    with open(f'data/monitoring/data_{YESTERDAY_FULL}.json', 'w', encoding='utf-8') as f:
-        json.dump(total_posts, f, ensure_ascii=False, indent=4)
-
 if __name__ == "__main__":
-    driver = get_driver()
     try:
-        p_data = get_ppomppu_posts(driver)
-        d_data = get_dc_posts(driver)
+        p_data, d_data = crawl_communities()
         analyze_and_notify(p_data, d_data)
         print("✅ 작업 완료")
     except Exception as e:
         print(f"Error: {e}")
     finally:
-        driver.quit()
+        close_driver()
+        browser.save_stats(LOAD_STATS_FILE)
+        replay.save_archive()
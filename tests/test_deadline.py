@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytest  # noqa: E402
+import main  # noqa: E402
+from selenium.common.exceptions import TimeoutException  # noqa: E402
+
+LIST_PAGE_SEC = 0.4
+DETAIL_SEC = 0.02
+
+
+class FakeDriver:
+    page_source = "<html></html>"
+    current_url = "https://example.com/event"
+
+
+def fake_navigate(driver, url):
+    # 실제 navigate 처럼 남은 예산을 페이지 로드 상한으로 사용, 넘으면 로드 타임아웃
+    limit = main.page_deadline(main.PAGE_TIMEOUT)
+    time.sleep(min(limit, LIST_PAGE_SEC))
+    if limit < LIST_PAGE_SEC: raise TimeoutException("page load")
+    driver.page = int(url.rsplit("=", 1)[1])
+
+
+def fake_links(driver, site_name, keywords, onclick=None, base=""):
+    return {f"https://example.com/event/{driver.page}-{i}": {"text": f"이벤트 {i}", "thumb": ""} for i in range(5)}
+
+
+def fake_detail(driver, site_name, url, target_selector):
+    main.page_deadline(main.PAGE_TIMEOUT)
+    time.sleep(DETAIL_SEC)
+    return {"title": url, "content": "<div>본문</div>", "text": "본문", "hash": url}
+
+
+@pytest.fixture(autouse=True)
+def clear_deadline():
+    yield
+    # 스레드 로컬 마감 시각이 다른 테스트로 새지 않도록
+    main._deadline_ctx.until = main._deadline_ctx.list_until = None
+
+
+def test_list_overrun_keeps_budget_for_details(monkeypatch):
+    # 목록 3페이지(각 0.4초)가 전체 예산 1초를 넘기는 사이트
+    monkeypatch.setattr(main, "SITE_BUDGET", 1.0)
+    monkeypatch.setattr(main, "LIST_BUDGET_SHARE", 0.5)
+    monkeypatch.setattr(main, "navigate", fake_navigate)
+    monkeypatch.setattr(main, "wait_until_ready", lambda *a, **k: True)
+    monkeypatch.setattr(main, "extract_list_links", fake_links)
+    monkeypatch.setattr(main, "fetch_detail", fake_detail)
+    monkeypatch.setattr(main.browser, "log_page", lambda *a, **k: {})
+
+    main.load_browser_modules()
+    main.start_deadline("테스트")
+    result = main.crawl_site_logic(FakeDriver(), "테스트", "https://example.com/event", "page")
+
+    assert main._deadline_ctx.partial
+    assert 0 < len(result) <= 10
+    assert all(url.startswith("https://example.com/event/1-") for url in list(result)[:5])
+
+
+def test_list_phase_cap_ends_before_details():
+    main.start_deadline("테스트")
+    main._deadline_ctx.list_until = time.monotonic() - 1
+    try:
+        main.page_deadline(main.PAGE_TIMEOUT)
+        assert False, "목록 단계 상한이 적용되지 않음"
+    except main.SiteTimeout:
+        pass
+    main.end_list_phase()
+    assert main.page_deadline(main.PAGE_TIMEOUT) > 0
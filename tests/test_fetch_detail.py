@@ -0,0 +1,39 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+
+PAGE = """<html><head><title>갤럭시 브랜드관 오픈 | T 다이렉트샵</title></head><body>
+<div class="header-search" style="display: none;"><h2 class="popular-title">인기 급상승</h2></div>
+<div class="modal" aria-hidden="true"><h1 class="title">안내</h1></div>
+<div id="contents"><p>브랜드관 오픈 기념 사은품 증정</p></div>
+</body></html>"""
+
+
+class FakeResponse:
+    status_code, encoding, headers = 200, "utf-8", {}
+    text = PAGE
+    content = PAGE.encode("utf-8")
+
+
+class FakeSession:
+    def get(self, url, timeout=None): return FakeResponse()
+
+
+def test_http_title_skips_statically_hidden_candidates(monkeypatch):
+    monkeypatch.setattr(main, "get_http_session", lambda: FakeSession())
+    page = main.fetch_detail_http("https://shop.example.com/event/1", "#contents")
+    assert page["title"] == "갤럭시 브랜드관 오픈 | T 다이렉트샵"
+
+
+def test_http_title_mismatch_falls_back_to_browser(monkeypatch):
+    monkeypatch.setattr(main, "get_http_session", lambda: FakeSession())
+    monkeypatch.setattr(main, "fetch_detail_browser", lambda driver, site, url, sel: {"title": "브라우저 제목", "content": "", "text": "본문", "hash": "h"})
+    monkeypatch.setitem(main._known_titles, "https://shop.example.com/event/1", "브라우저 제목")
+    monkeypatch.setattr(main, "SITE_FETCH_MODE", {})
+    page = main.fetch_detail(None, "테스트", "https://shop.example.com/event/1", "#contents")
+    assert page["title"] == "브라우저 제목"
+    assert main._fetch_stats["https://shop.example.com/event/1"]["mode"] == "fallback"
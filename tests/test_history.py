@@ -0,0 +1,45 @@
+import os
+import sys
+import json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import monitor_crawler  # noqa: E402
+
+
+def entry(date):
+    return {"date": date, "total_volume": {"ppomppu": 2}, "brand_sov": {"SK7": 1}}
+
+
+def post(link, views, comments=0):
+    return {"source": "ppomppu", "title": "알뜰폰 후기", "link": link, "views": views, "comments": comments}
+
+
+def post_lines(date):
+    with open(monitor_crawler.history_path('posts', date), 'r', encoding='utf-8') as f:
+        return [line for line in f if json.loads(line)['date'] == date]
+
+
+def test_rerun_appends_only_new_or_changed_posts(monkeypatch, tmp_path):
+    monkeypatch.setattr(monitor_crawler, "HISTORY_DIR", str(tmp_path / "history"))
+    date = "2026-02-01"
+
+    monitor_crawler.save_history(entry(date), [post("a", 10), post("b", 5)])
+    assert len(post_lines(date)) == 2
+
+    # 같은 달의 다른 날짜가 쌓여 있어도 저장 시 월 파일을 다시 읽지 않음
+    monitor_crawler.save_history(entry("2026-02-02"), [post("z", 1)])
+    def no_scan(*args): raise AssertionError("월 파일 재조회")
+    with monkeypatch.context() as m:
+        m.setattr(monitor_crawler, "read_jsonl", no_scan)
+        monitor_crawler.save_history(entry(date), [post("a", 10), post("b", 5)])
+    assert len(post_lines(date)) == 2
+
+    # b 조회수 변경 + 새 글 c → 2줄만 추가, 읽을 때는 링크별 마지막 줄
+    monitor_crawler.save_history(entry(date), [post("a", 10), post("b", 7), post("c", 1)])
+    assert len(post_lines(date)) == 4
+    posts = {p['link']: p for p in monitor_crawler.read_posts(date, date)}
+    assert sorted(posts) == ["a", "b", "c"]
+    assert posts["b"]["views"] == 7
@@ -0,0 +1,44 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import browser  # noqa: E402
+
+
+class FakeDriver:
+    def __init__(self, crash_on=None):
+        self.page_timeout, self.crash_on, self.alive = 300, crash_on, True
+
+    def set_page_load_timeout(self, seconds): self.page_timeout = seconds
+    def execute_cdp_cmd(self, cmd, params): return {}
+    def get_log(self, kind): return []
+    def quit(self): self.alive = False
+
+    def execute_script(self, script):
+        if not self.alive: raise RuntimeError("dead")
+        return 1
+
+    def get(self, url):
+        if url == self.crash_on:
+            self.alive = False
+            raise RuntimeError("crashed")
+        return self.page_timeout
+
+
+def test_recycled_driver_keeps_page_load_timeout(monkeypatch):
+    monkeypatch.setattr(browser, "DRIVER_MAX_NAVIGATIONS", 2)
+    managed = browser.ManagedDriver(FakeDriver).ensure()
+    for url in ("a", "b", "c"):
+        managed.set_page_load_timeout(12)
+        assert managed.get(url) == 12
+    assert managed.restarts == 1
+
+
+def test_restart_after_crash_keeps_page_load_timeout():
+    drivers = [FakeDriver(crash_on="boom"), FakeDriver()]
+    managed = browser.ManagedDriver(lambda: drivers.pop(0)).ensure()
+    managed.set_page_load_timeout(7)
+    assert managed.get("boom") == 7
+    assert managed.restarts == 1
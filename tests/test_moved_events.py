@@ -0,0 +1,48 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+
+SITE = "SK 7세븐모바일"
+BASE = "https://www.sk7mobile.com/bnef/event/eventIngView.do?cntId="
+GENERIC_TITLE = "나를 아끼는 모바일 - SK 7mobile"
+
+
+def page(title, text):
+    return {"title": title, "text": text, "content": f"<div>{text}</div>"}
+
+
+def event_text(n):
+    return f"{n}월 신규 가입 고객 대상 데이터 무제한 요금제 첫 달 무료 이벤트 참여 방법 및 유의사항 안내 경품 {n * 7}명 추첨"
+
+
+def corpus_with(*extra):
+    pages = [page(f"{n}월 이벤트 - SK 7mobile", event_text(n)) for n in range(4, 10)]
+    return pages + list(extra)
+
+
+def test_moved_event_is_matched():
+    old = page("3월 데이터 무제한 이벤트 - SK 7mobile", event_text(3))
+    new = page("3월 데이터 무제한 이벤트 - SK 7mobile", event_text(3))
+    pairs = main.match_moved_events([{"url": BASE + "evt3b", "data": new}], [{"url": BASE + "evt3", "data": old}], SITE, corpus_with(old, new))
+    assert [(n["url"], d["url"]) for n, d, _ in pairs] == [(BASE + "evt3b", BASE + "evt3")]
+
+
+def test_empty_error_pages_are_not_matched():
+    # 잘못된 cntId 로 열린 오류 페이지: 본문 없이 사이트 공통 제목만 있음
+    new = page(GENERIC_TITLE, "")
+    old = page(GENERIC_TITLE, "")
+    pairs = main.match_moved_events([{"url": BASE + "http://www.sktelink.com", "data": new}], [{"url": BASE + "memberPolicy", "data": old}], SITE, corpus_with(new, old))
+    assert pairs == []
+
+
+def test_shared_error_body_is_not_matched():
+    error = "요청하신 페이지를 찾을 수 없습니다. 주소를 다시 확인해 주세요. 고객센터 114"
+    new = page(GENERIC_TITLE, error)
+    old = page(GENERIC_TITLE, error)
+    others = [page(GENERIC_TITLE, error) for _ in range(2)]
+    pairs = main.match_moved_events([{"url": BASE + "https://spam.kisa.or.kr", "data": new}], [{"url": BASE + "memberPolicy", "data": old}], SITE, corpus_with(new, old, *others))
+    assert pairs == []
@@ -0,0 +1,48 @@
+import os
+import sys
+import re
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+
+
+def apply(engine, text):
+    if engine["combined"]: text = engine["combined"].sub('', text)
+    for _, pattern, repl in engine["replace"]: text = pattern.sub(repl, text)
+    return text
+
+
+def test_inline_global_flag_rule_runs_alone():
+    rules = [{"name": "views", "pattern": r"조회\s*\d+"}, {"name": "loading", "pattern": r"(?i)loading"}]
+    engine = main.compile_noise_rules(rules)
+    assert engine["names"] == ["views"]
+    assert apply(engine, "LOADING 조회 12 본문 Loading") == "  본문 "
+    # 다른 규칙에 대소문자 무시가 번지지 않음
+    assert apply(main.compile_noise_rules([{"name": "x", "pattern": "abc"}, rules[1]]), "ABC") == "ABC"
+
+
+def test_group_reference_rules_keep_their_numbering():
+    rules = [
+        {"name": "views", "pattern": r"(조회|조회수)\s*\d+"},
+        {"name": "repeat", "pattern": r"(\w)\1{3,}"},
+        {"name": "named", "pattern": r"(?P<n>\d+)명"},
+    ]
+    engine = main.compile_noise_rules(rules)
+    assert engine["names"] == ["views"]
+    assert apply(engine, "조회수 3 ㅋㅋㅋㅋㅋ 100명 당첨") == "   당첨"
+
+
+def test_combined_compile_error_falls_back_to_sequential(monkeypatch):
+    real = re.compile
+
+    def compile(pattern, flags=0):
+        if isinstance(pattern, str) and pattern.count("(?P<r") > 1: raise re.error("too complex")
+        return real(pattern, flags)
+
+    monkeypatch.setattr(main.re, "compile", compile)
+    engine = main.compile_noise_rules([{"name": "a", "pattern": "aa"}, {"name": "b", "pattern": "bb"}])
+    assert engine["combined"] is None
+    assert [n for n, _, _ in engine["replace"]] == ["a", "b"]
+    assert apply(engine, "aabbcc") == "cc"
@@ -0,0 +1,77 @@
+import os
+import sys
+import json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import main  # noqa: E402
+import migrate_snapshots  # noqa: E402
+
+
+def use_tmp_data(monkeypatch, tmp_path):
+    data_dir = str(tmp_path / "data")
+    os.makedirs(data_dir)
+    monkeypatch.setattr(main, "DATA_DIR", data_dir)
+    monkeypatch.setattr(main, "SNAPSHOT_DIR", os.path.join(data_dir, "snapshots"))
+    monkeypatch.setattr(main, "BLOB_DIR", os.path.join(data_dir, "blobs"))
+    monkeypatch.setattr(main, "SNAPSHOT_INDEX", os.path.join(data_dir, "snapshot_index.json"))
+    return data_dir
+
+
+def write_legacy(data_dir, ts, content):
+    data = {"SK7모바일": {"https://example.com/event/1": {"title": "이벤트", "img": "", "content": content}}}
+    with open(os.path.join(data_dir, f"data_{ts}.json"), "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return data
+
+
+def test_migrate_without_delete_keeps_one_run_per_timestamp(monkeypatch, tmp_path):
+    data_dir = use_tmp_data(monkeypatch, tmp_path)
+    first = write_legacy(data_dir, "20260101_090000", "본문 1")
+    second = write_legacy(data_dir, "20260102_090000", "본문 2")
+
+    migrate_snapshots.migrate(delete=False)
+
+    # 원본 data_*.json 은 남아 있지만 목록/인덱스에는 타임스탬프당 manifest 하나만
+    assert os.path.exists(os.path.join(data_dir, "data_20260101_090000.json"))
+    snapshots = main.list_snapshots()
+    assert [ts for ts, _ in snapshots] == ["20260101_090000", "20260102_090000"]
+    assert all(os.path.basename(p).startswith("manifest_") for _, p in snapshots)
+
+    index = main.rebuild_snapshot_index()
+    assert [r["ts"] for r in index["runs"]] == ["20260101_090000", "20260102_090000"]
+    assert all(r["format"] == "manifest" for r in index["runs"])
+    assert main.load_snapshot(snapshots[0][1]) == first
+    assert main.load_snapshot(snapshots[1][1]) == second
+
+
+def test_legacy_only_snapshot_is_still_listed(monkeypatch, tmp_path):
+    data_dir = use_tmp_data(monkeypatch, tmp_path)
+    write_legacy(data_dir, "20260101_090000", "본문")
+
+    snapshots = main.list_snapshots()
+    assert [ts for ts, _ in snapshots] == ["20260101_090000"]
+    assert main.rebuild_snapshot_index()["runs"][0]["format"] == "legacy"
+
+
+def test_partial_run_updates_baseline_only_for_urls_it_saw(monkeypatch, tmp_path):
+    use_tmp_data(monkeypatch, tmp_path)
+    site = "SK7모바일"
+
+    def pages(*items): return {site: {f"https://example.com/event/{k}": {"title": k, "img": "", "content": v, "text": v} for k, v in items}}
+
+    main.add_to_snapshot_index(main.save_snapshot(pages(("a", "본문 a"), ("b", "본문 b")), "20260101_090000", {site: "ok"}))
+    # 시간 예산 초과 실행: a 본문 변경, 신규 c 를 이미 알림, b 는 보지 못함
+    main.add_to_snapshot_index(main.save_snapshot(pages(("a", "본문 a2"), ("c", "본문 c")), "20260102_090000", {site: "partial"}))
+
+    baseline = main.load_baseline()
+    assert {u[-1]: p["text"] for u, p in baseline[site].items()} == {"a": "본문 a2", "b": "본문 b", "c": "본문 c"}
+    assert baseline.sources[site] == "20260102_090000"
+
+    # 다음 전체 실행: a/c 는 다시 알리지 않고, 못 본 b 는 여기서 종료 판정
+    today = pages(("a", "본문 a2"), ("c", "본문 c"))
+    list_new, list_upd, list_del = main.compare_all(today, baseline, parallel=False)[site]
+    assert list_new == [] and list_upd == []
+    assert [d["url"] for d in list_del] == ["https://example.com/event/b"]